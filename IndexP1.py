@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+from ranking import DEFAULT_TOP_K, most_breaching_rows
+
 # Configure the page
 st.set_page_config(page_title="Performance Report Comparison", layout="wide")
 st.title("Performance Report Analysis")
@@ -90,8 +92,12 @@ if df is not None:
         slow_transactions = filtered_df[filtered_df.filter(like='Run').gt(filtered_df['SLA'], axis=0).any(axis=1)]
         
         if not slow_transactions.empty:
-            st.warning("The following transactions exceed the SLA:")
-            st.dataframe(slow_transactions[['TransactionName', 'SLA'] + [col for col in available_cols if 'Run' in col]])
+            sla_cols = ['TransactionName', 'SLA'] + [col for col in available_cols if 'Run' in col]
+            breaching = most_breaching_rows(slow_transactions, [col for col in available_cols if 'Run' in col], DEFAULT_TOP_K)
+            st.warning(f"{len(slow_transactions)} transactions exceed the SLA. The {len(breaching)} most breaching:")
+            st.dataframe(breaching[sla_cols])
+            with st.expander("Show all transactions exceeding SLA"):
+                st.dataframe(slow_transactions[sla_cols])
         else:
             st.success("No transactions exceed SLA limits.")
     
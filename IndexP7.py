@@ -5,6 +5,8 @@ from docx import Document
 from io import BytesIO
 import matplotlib.pyplot as plt
 
+from chart_render import run_bar_chart, trend_line_chart, comparison_chart
+
 # Configure the page
 st.set_page_config(page_title="Performance Report Comparison", layout="wide")
 st.title("Performance Report Analysis")
@@ -90,14 +92,13 @@ if df is not None:
     st.header("Graphical Comparison")
     for run in ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']:
         if run in filtered_df.columns:
-            fig = px.bar(filtered_df, x='TransactionName', y=run, title=f"{run} Response Time", color='TransactionName')
+            fig = run_bar_chart(filtered_df, run)
             st.plotly_chart(fig, use_container_width=True)
     
     # Additional Graph: Comparing response times in one graph
     if all(run in filtered_df.columns for run in ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']):
         st.header("Run Comparison in a Single Graph")
-        df_melted = filtered_df.melt(id_vars=['TransactionName'], value_vars=['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent'], var_name='Run', value_name='Response Time')
-        fig_comparison = px.bar(df_melted, x='TransactionName', y='Response Time', color='Run', title="Response Time Comparison Across Runs")
+        fig_comparison = comparison_chart(filtered_df, ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent'], barmode='relative', title="Response Time Comparison Across Runs")
         st.plotly_chart(fig_comparison, use_container_width=True)
     
     # Section 7: Performance Trend Analysis with Response Time Filtering
@@ -112,10 +113,9 @@ if df is not None:
                     selected_range = st.slider(f"Select {run_col} response time range", min_rt, max_rt, (min_rt, max_rt))
                     filtered_df = filtered_df[(filtered_df[run_col] >= selected_range[0]) & (filtered_df[run_col] <= selected_range[1])]    
     
-    df_trend = filtered_df.melt(id_vars='TransactionName', value_vars=[col for col in available_cols if 'Run' in col], var_name='Run', value_name='Response Time')
+    fig_trend = trend_line_chart(filtered_df, [col for col in available_cols if 'Run' in col])
     
-    if not df_trend.empty:
-        fig_trend = px.line(df_trend, x='TransactionName', y='Response Time', color='Run', markers=True, title="Response Time Trend Over Runs")
+    if fig_trend is not None:
         st.plotly_chart(fig_trend, use_container_width=True)
     
     # Section 8: Generate Word Report
@@ -1,46 +1,298 @@
+import time
+run_started = time.perf_counter()
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from docx import Document
 from io import BytesIO
 import matplotlib.pyplot as plt
+import os
+from datetime import date
+
+from baseline import Baseline, list_baselines
+from chart_render import builds_slowly, run_bar_chart, trend_line_chart, comparison_chart
+from figure_cache import cached_figure
+from histogram_service import bin_edges, histogram_figure
+from kernels import grouped_breach_count, grouped_histogram
+from cache_registry import registered_cache
+from memory_governor import MIN_BUDGET_MB, MemoryGovernor
+from metrics import EXPORT_SECONDS, RERUN_SECONDS, SESSION_BYTES, serve
+from frame_backend import BACKENDS, get_backend
+from frame_view import FrameView
+from history_store import open_store, ingest_report, stored_dates, query_trend
+from ranking import DEFAULT_TOP_K, cached_rankings
+from warmup import STARTUP, is_warm, preloaded_summary, record_request, warm_up_in_background
+from sla_rules import DEFAULT_RULES, STATUS_ICONS, compile_rules, load_rules
+from report_cache import list_cached, load_summary
+from report_append import ReportState
+from report_loader import SAMPLE_ROWS, UPLOAD_TYPES, file_key, load_progressive, read_report, report_ready
+from report_schema import DEFAULT_METRIC, run_columns
+from metric_cube import MetricCube
+from perf_timing import section_timer, show_rerun_log, plotly_chart as timed_plotly_chart, dataframe as timed_dataframe
+from sql_mode import HAVE_DUCKDB, TABLE_NAME, check_select, register_upload, column_names, distinct_values, compile_filters, stream_query, fetch_frame, quote_ident
+
+SQL_PREVIEW_ROWS = 1000
+SQL_DISPLAY_ROWS = 100_000
 
 # Configure the page
 st.set_page_config(page_title="Performance Report Comparison", layout="wide")
 st.title("Performance Report Analysis")
+warm_up_in_background()
+
+# Metrics endpoint for a local scraper, started once per server process
+@st.cache_resource
+def start_metrics_server():
+    return serve()
+
+start_metrics_server()
 
 # Sidebar: File upload
 st.sidebar.header("Upload Test Report")
-uploaded_file = st.sidebar.file_uploader("Upload the report file", type=["csv", "xlsx"])
+uploaded_file = st.sidebar.file_uploader("Upload the report file", type=UPLOAD_TYPES,
+                                         help="Plain, gzip/zstd/bz2-compressed, or a zip whose files are joined as consecutive runs.")
+sql_mode = st.sidebar.checkbox("SQL query mode (DuckDB)", value=False, disabled=not HAVE_DUCKDB,
+                               help="Scan the upload out-of-core and push filters down as SQL. Requires the duckdb package.")
+
+@registered_cache("history store", kind="resource")
+def get_history_store():
+    return open_store()
+
+# Each entry owns a DuckDB connection and possibly a temp copy of the upload, so only a few are kept
+@registered_cache("sql connections", kind="resource", max_entries=4)
+def get_sql_connection(file_key, _file):
+    return register_upload(_file)
+
+@registered_cache("metric cubes", kind="resource", max_entries=4)
+def get_metric_cube(report_key, _df):
+    return MetricCube.from_frame(_df)
+
+# A Polars scan keeps the Arrow copies of the columns it has filtered on, so it is kept per report and backend
+@registered_cache("backend scans", kind="resource", max_entries=4)
+def get_scan(scan_key, backend_name, _df):
+    return get_backend(backend_name).scan(_df)
+
+@registered_cache("report summaries", kind="resource", max_entries=8)
+def get_cached_summary(digest):
+    return preloaded_summary(digest) or load_summary(digest)
 
-@st.cache_data
-def load_data(file):
-    if file is not None:
-        if file.name.endswith('.csv'):
-            return pd.read_csv(file)
+@registered_cache("sla rule sets", kind="resource", max_entries=16)
+def get_rule_set(rules_key, cube_key, metric, _spec, _cube):
+    return compile_rules(_spec, _cube, metric)
+
+@registered_cache("baselines", kind="resource", max_entries=8)
+def get_baseline(path, modified):
+    return Baseline.load(path)
+
+@st.fragment(run_every=1)
+def wait_for_full_report(file):
+    if report_ready(file):
+        st.rerun()
+
+# Widget-heavy sections run as fragments so their widgets rerun only that section
+use_fragments = st.sidebar.checkbox("Fragment-scoped reruns", value=True,
+                                    help="Turn off to compare against full-script reruns in the Rerun timings panel.")
+fragment = st.fragment if use_fragments else (lambda func: func)
+# Row and range filters run in this backend; Polars evaluates them as lazy, multi-threaded plans
+backend = get_backend(st.sidebar.selectbox("Dataframe backend", list(BACKENDS)) if len(BACKENDS) > 1 else "pandas")
+report_figures = st.session_state.setdefault('report_figures', {})
+# Per-session byte budget: frames kept between reruns spill to disk when the session's working set is too large
+governor = st.session_state.setdefault('memory_governor', MemoryGovernor())
+
+def note_frame(name, view, cols=None):
+    # Frames built for this rerun's render or export only: noted so they count towards the session budget
+    # while the rerun uses them, and released with it instead of being pinned until the next rerun
+    return governor.note(name, view.materialize(cols))
+
+@fragment
+def transaction_comparison(filtered_view, available_cols):
+    with section_timer("Comparison by transaction") as timing:
+        st.subheader("Graphical Comparison by Transaction")
+        transaction_options = filtered_view.unique('TransactionName').tolist()
+        selected_transactions = st.multiselect("Select transactions to display in graph", transaction_options, default=transaction_options if transaction_options else [])
+        
+        if selected_transactions:
+            comparison_cols = tuple(col for col in available_cols if 'Run' in col)
+            df_graph = filtered_view.where_isin('TransactionName', selected_transactions).materialize(['TransactionName', *comparison_cols])
+            fig = cached_figure(comparison_chart, df_graph, cache_if=builds_slowly, run_cols=comparison_cols)
+            
+            if fig is not None:
+                timed_plotly_chart(fig, timing, use_container_width=True)
+                report_figures['comparison'] = fig
+
+@fragment
+def top_k_section(rankings, filtered_view, rank_cols):
+    with section_timer("Top-K transactions") as timing:
+        st.header("Top-K Transactions")
+        tab_names = ["Slowest per run", "Most regressed"] + (["Most breaching"] if 'breaching' in rankings else [])
+        tabs = st.tabs(tab_names)
+        with tabs[0]:
+            timed_dataframe(rankings['slowest'], timing, use_container_width=True)
+        with tabs[1]:
+            timed_dataframe(rankings['regressed'], timing, use_container_width=True)
+        if 'breaching' in rankings:
+            with tabs[2]:
+                timed_dataframe(rankings['breaching'], timing, use_container_width=True)
+
+        # Drill-down into one ranked transaction
+        ranked_names = [frame['TransactionName'] for frame in rankings.values() if not frame.empty]
+        ranked = pd.concat(ranked_names).unique().tolist() if ranked_names else []
+        if not ranked:
+            st.info("No ranked transactions for the current filters.")
+        else:
+            drill = st.selectbox("Drill down into transaction", ranked)
+            detail = filtered_view.where_isin('TransactionName', [drill]).materialize()
+            timed_dataframe(detail, timing, use_container_width=True)
+            drill_plot = governor.note('drill_plot', detail.melt(id_vars='TransactionName', value_vars=rank_cols, var_name='Run', value_name='Response Time'))
+            fig = px.bar(drill_plot, x='Run', y='Response Time', title=f"{drill} by Run")
+            if 'SLA' in detail.columns and not detail['SLA'].isna().all():
+                fig.add_hline(y=float(detail['SLA'].iloc[0]), line_dash='dash', annotation_text='SLA')
+            timed_plotly_chart(fig, timing, use_container_width=True)
+
+@fragment
+def trend_analysis(filtered_view, available_cols, known_trend=None, scan=None):
+    with section_timer("Section 7: Trend analysis") as timing:
+        st.subheader("Performance Trend Analysis")
+        
+        unfiltered_rows = len(filtered_view)
+        ranges = {}
+        for run_col in [col for col in available_cols if 'Run' in col]:
+            if run_col in filtered_view.columns:
+                run_values = pd.Series(filtered_view.values(run_col))
+                min_rt, max_rt = run_values.min(), run_values.max()
+                if min_rt != max_rt:
+                    ranges[run_col] = st.slider(f"Select {run_col} response time range", min_rt, max_rt, (min_rt, max_rt))
+        # Ranges on df's own columns run in the selected backend, which answers with the positions to keep
+        scanned = {col: bounds for col, bounds in ranges.items() if col not in filtered_view.extra} if scan is not None else {}
+        if scanned:
+            kept = backend.range_rows(scan, scanned, filtered_view.positions)
+            filtered_view = filtered_view.select(np.isin(filtered_view.positions, kept))
+        for run_col, selected_range in ranges.items():
+            if run_col not in scanned:
+                filtered_view = filtered_view.where_between(run_col, *selected_range)
+        narrowed = len(filtered_view) != unfiltered_rows
+        # The slider-filtered view feeds Sections 8 and 9; it is only positions, and is materialised when they export
+        st.session_state['trend_view'] = filtered_view
+        
+        trend_cols = tuple(col for col in available_cols if 'Run' in col)
+        fig_trend = None
+        if known_trend is not None and not narrowed and not filtered_view.empty:
+            # Sliders untouched: the long-format trend kept by a precomputed summary or the appended report is used as-is
+            fig_trend = trend_line_chart(filtered_view.materialize(['TransactionName', *trend_cols]), trend_cols, melted=known_trend)
+        elif not filtered_view.empty and trend_cols:
+            fig_trend = cached_figure(trend_line_chart, filtered_view.materialize(['TransactionName', *trend_cols]), cache_if=builds_slowly, run_cols=trend_cols)
+        
+        if fig_trend is not None:
+            timed_plotly_chart(fig_trend, timing, use_container_width=True)
+            report_figures['trend'] = fig_trend
         else:
-            return pd.read_excel(file)
-    return None
+            st.warning("No data available for trend analysis.")
+
+        # Per-run distribution and SLA breaches of the slider-filtered rows: run columns laid end to end
+        # are contiguous groups, so the grouped kernels answer both in one pass
+        if trend_cols and len(filtered_view):
+            stacked = np.concatenate([np.asarray(filtered_view.values(col), dtype=np.float64) for col in trend_cols])
+            offsets = np.arange(len(trend_cols) + 1, dtype=np.int64) * len(filtered_view)
+            if not np.isnan(stacked).all():
+                edges = bin_edges(float(np.nanmin(stacked)), float(np.nanmax(stacked)), bins=40)
+                counts = grouped_histogram(stacked, offsets, edges)
+                fig_dist = histogram_figure([(col, edges, counts[i]) for i, col in enumerate(trend_cols)],
+                                            "Response Time Distribution by Run", x_title="Response Time")
+                timed_plotly_chart(fig_dist, timing, use_container_width=True)
+            if 'SLA' in filtered_view.columns:
+                sla = np.asarray(filtered_view.values('SLA'), dtype=np.float64)
+                breaches = grouped_breach_count(stacked, offsets, np.tile(sla, len(trend_cols)))
+                st.caption("Above SLA in the selected ranges: " +
+                           " | ".join(f"{col}: {count}" for col, count in zip(trend_cols, breaches)))
+
+        # Historical trend across stored nightly runs
+        history_dates = stored_dates(history)
+        if history_dates:
+            st.subheader("Historical Trend Across Runs")
+            first_date, last_date = date.fromisoformat(history_dates[0]), date.fromisoformat(history_dates[-1])
+            history_range = st.date_input("History date range", value=(first_date, last_date), min_value=first_date, max_value=last_date)
+            if isinstance(history_range, tuple) and len(history_range) == 2:
+                history_txns = pd.unique(filtered_view.unique('TransactionName').astype(str)).tolist()
+                df_history = query_trend(history, history_txns, history_range[0], history_range[1])
+                if not df_history.empty:
+                    fig_history = px.line(df_history, x='run_date', y='response_time', color='TransactionName', markers=True, title="90th Percentile Trend by Run Date")
+                    timed_plotly_chart(fig_history, timing, use_container_width=True)
+                else:
+                    st.warning("No stored history for the selected transactions and dates.")
+
+# Reports precomputed by ingest_daemon.py open without parsing
+cached_summary = None
+cached_reports = {entry['digest']: entry for entry in list_cached()}
+if uploaded_file is None and cached_reports:
+    cached_choice = st.sidebar.selectbox("Or open a precomputed report", [None] + list(cached_reports),
+                                         format_func=lambda digest: "—" if digest is None else cached_reports[digest]['name'])
+    if cached_choice is not None:
+        cached_summary = get_cached_summary(cached_choice)
 
-df = load_data(uploaded_file)
+sql_con = None
+if sql_mode and uploaded_file is not None:
+    sql_con = get_sql_connection(file_key(uploaded_file), uploaded_file)
+    df = fetch_frame(sql_con, f"SELECT * FROM {quote_ident(TABLE_NAME)} LIMIT {SQL_PREVIEW_ROWS}")
+    df_complete = True
+elif uploaded_file is not None:
+    try:
+        df, df_complete = load_progressive(uploaded_file)
+    except Exception as exc:
+        st.error(f"Could not read {uploaded_file.name}: {exc}")
+        df, df_complete = None, True
+elif cached_summary is not None:
+    df, df_complete = cached_summary['frame'], True
+else:
+    df, df_complete = None, True
+if uploaded_file is not None:
+    report_key, report_name = file_key(uploaded_file), uploaded_file.name
+elif cached_summary is not None:
+    report_key, report_name = f"cache:{cached_choice}", cached_summary['name']
+
+# Runs appended to the loaded report live in the session and replace the parsed frame
+report_state = None
+saved_state = st.session_state.get('report_state')
+if df is not None and sql_con is None and saved_state is not None and saved_state[0] == report_key:
+    report_state = saved_state[1]
+    df = report_state.frame
+history = get_history_store()
 
 if df is not None:
+    governor.note('df', df)
+    if not df_complete:
+        st.info(f"Showing the first {SAMPLE_ROWS} rows while the full report loads in the background.")
+        wait_for_full_report(uploaded_file)
+
     # Section 1: Report Preview
-    st.header("Report Preview")
-    st.dataframe(df)
+    with section_timer("Section 1: Preview") as timing:
+        st.header("Report Preview")
+        if sql_con is not None:
+            st.caption(f"SQL mode: showing the first {SQL_PREVIEW_ROWS} rows")
+        timed_dataframe(df, timing)
     
     # Section 2: Filtering Table
     st.header("Filtered Data Table")
-    filter_columns = st.sidebar.multiselect("Select columns for filtering", df.columns.tolist(), default=df.columns.tolist())
-    logical_column = st.sidebar.selectbox("Select column for row filtering", df.columns.tolist())
-    unique_vals = df[logical_column].dropna().unique().tolist()
+    all_columns = column_names(sql_con) if sql_con is not None else df.columns.tolist()
+    filter_columns = st.sidebar.multiselect("Select columns for filtering", all_columns, default=all_columns)
+    logical_column = st.sidebar.selectbox("Select column for row filtering", all_columns)
+    if sql_con is not None:
+        unique_vals = distinct_values(sql_con, logical_column)
+    else:
+        unique_vals = df[logical_column].dropna().unique().tolist()
     selected_vals = st.sidebar.multiselect("Select row values to display", unique_vals, default=unique_vals)
     
-    if logical_column in df.columns:
-        filtered_df = df[df[logical_column].isin(selected_vals)][filter_columns]
+    # The filter chain carries row positions and a column projection over df; frames are built only to render or export.
+    # Outside SQL mode the row filter runs in the selected dataframe backend, which returns the positions to keep.
+    scan = None
+    if sql_con is not None:
+        filtered_view = FrameView(fetch_frame(sql_con, *compile_filters(filter_columns, logical_column, selected_vals)))
     else:
-        filtered_df = df[filter_columns]
+        scan_key = f"{report_key}:{df_complete}:{len(report_state.appended) if report_state is not None else 0}"
+        scan = get_scan(scan_key, backend.name, df)
+        filtered_view = FrameView(df, backend.filter_rows(scan, logical_column, selected_vals), filter_columns)
     
+    filtered_df = note_frame('filtered_df', filtered_view)
     st.dataframe(filtered_df)
     
     # Section 3: Download Filtered Data
@@ -48,31 +300,129 @@ if df is not None:
     file_format = st.sidebar.radio("Select format", ["CSV", "Excel"])
     
     if st.sidebar.button("Download"):
-        if not filtered_df.empty:
+        if not filtered_view.empty:
             if file_format == "CSV":
-                filtered_df.to_csv("filtered_data.csv", index=False)
+                with EXPORT_SECONDS.time(format="csv"):
+                    filtered_df.to_csv("filtered_data.csv", index=False)
                 st.sidebar.success("Filtered data saved as filtered_data.csv")
             else:
-                filtered_df.to_excel("filtered_data.xlsx", index=False)
+                with EXPORT_SECONDS.time(format="excel"):
+                    filtered_df.to_excel("filtered_data.xlsx", index=False)
                 st.sidebar.success("Filtered data saved as filtered_data.xlsx")
         else:
             st.sidebar.error("No data available to download.")
 
+    # Custom SQL for power users, streamed back in batches
+    if sql_con is not None:
+        st.header("Custom SQL Query")
+        custom_sql = st.text_area(f"Query the uploaded report as table `{TABLE_NAME}`",
+                                  f"SELECT * FROM {TABLE_NAME} LIMIT 100")
+        if st.button("Run SQL"):
+            status = st.empty()
+            result_slot = st.empty()
+            batches, row_count = [], 0
+            try:
+                for batch in stream_query(sql_con, check_select(custom_sql)):
+                    row_count += len(batch)
+                    if sum(len(b) for b in batches) < SQL_DISPLAY_ROWS:
+                        batches.append(batch)
+                        result_slot.dataframe(pd.concat(batches, ignore_index=True).head(SQL_DISPLAY_ROWS))
+                    status.info(f"{row_count} rows received")
+                status.success(f"Query returned {row_count} rows")
+            except Exception as exc:
+                status.error(f"Query failed: {exc}")
+
     
     
+    # Sidebar: Run history
+    st.sidebar.subheader("Run History")
+    run_date = st.sidebar.date_input("Run date of this report", value=date.today())
+    if st.sidebar.button("Save report to history", disabled=not df_complete):
+        if sql_con is not None:
+            history_cols = [col for col in all_columns if col in ('TransactionName', 'SLA')] + run_columns(all_columns)
+            report_df = fetch_frame(sql_con, *compile_filters(history_cols))
+        else:
+            report_df = df
+        saved = ingest_report(history, report_df, run_date, report_name=report_name)
+        if saved:
+            st.sidebar.success(f"Stored {saved} run results for {run_date}")
+        else:
+            st.sidebar.error("Report has no TransactionName/RunN-90Percent columns to store.")
+
+    # Metric cube: every run/metric column as one float32 array, so changing metric is a view change
+    if sql_con is not None:
+        cube, cube_rows = MetricCube.from_frame(filtered_view.base), None
+    elif report_state is not None:
+        cube, cube_rows = report_state.cube, filtered_view.positions
+    elif cached_summary is not None:
+        cube, cube_rows = cached_summary['cube'], filtered_view.positions
+    else:
+        cube = get_metric_cube(f"{report_key}:{df_complete}", df)
+        cube_rows = filtered_view.positions
+    metric_options = cube.metrics or [DEFAULT_METRIC]
+    metric = st.sidebar.selectbox("Metric", metric_options,
+                                  index=metric_options.index(DEFAULT_METRIC) if DEFAULT_METRIC in metric_options else 0)
+    metric_cols = [col for col in cube.columns_for(metric) if col in filtered_view.columns]
+
+    # Append a finished run to the loaded report; only the new run's aggregates are computed
+    st.sidebar.subheader("Append Run")
+    append_file = st.sidebar.file_uploader("Run file to append", type=UPLOAD_TYPES, key="append_run_file")
+    if st.sidebar.button("Append run", disabled=append_file is None or sql_con is not None or not df_complete):
+        try:
+            state = report_state if report_state is not None else ReportState(df)
+            new_col = state.append_run(read_report(append_file, append_file.name), metric)
+            st.session_state['report_state'] = (report_key, state)
+            st.sidebar.success(f"Appended {new_col}")
+            st.rerun()
+        except Exception as exc:
+            st.sidebar.error(f"Could not append run: {exc}")
+    if report_state is not None and report_state.appended:
+        st.sidebar.caption("Appended runs: " + ", ".join(report_state.appended))
+
+    # SLA rules compile once per rule file, report and metric
+    rules_file = st.sidebar.file_uploader("SLA rules (JSON/YAML)", type=["json", "yaml", "yml"])
+    try:
+        rules_spec = load_rules(rules_file.getvalue(), rules_file.name) if rules_file is not None else DEFAULT_RULES
+    except ValueError as exc:
+        st.sidebar.error(f"Could not read SLA rules: {exc}")
+        rules_file, rules_spec = None, DEFAULT_RULES
+    rules_key = file_key(rules_file) if rules_file is not None else "default"
+    cube_key = f"{report_key}:{df_complete}:{len(report_state.appended) if report_state is not None else 0}"
+
+    # A precomputed summary answers Sections 4, 5 and 7 directly while the page shows exactly what it covers
+    summary_fields = None
+    if (cached_summary is not None and report_state is None and rules_file is None
+            and metric == cached_summary['metric'] and len(filtered_view) == len(df)):
+        summary_fields = cached_summary
+
+    if summary_fields is not None:
+        rule_set = None
+    elif sql_con is not None:
+        rule_set = compile_rules(rules_spec, cube, metric)
+    else:
+        rule_set = get_rule_set(rules_key, cube_key, metric, rules_spec, cube)
+
     # Section 4: Response Time Comparison
-    st.header("Response Time Comparison: Run1 vs Run2 vs Run3")
-    required_cols = ['TransactionName', 'SLA', 'Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']
-    available_cols = [col for col in required_cols if col in filtered_df.columns]
+    st.header(f"Response Time Comparison ({metric}): {' vs '.join(col.split('-')[0] for col in metric_cols)}")
+    available_cols = [col for col in ['TransactionName', 'SLA'] if col in filtered_view.columns] + metric_cols
     
     if 'TransactionName' in available_cols and len(available_cols) > 1:
-        avg_response_times = {col: filtered_df[col].mean() for col in available_cols if 'Run' in col}
+        if summary_fields is not None and all(col in summary_fields['run_means'] for col in metric_cols):
+            run_means = summary_fields['run_means']
+        elif report_state is not None and len(filtered_view) == len(df):
+            run_means = report_state.run_means(metric)
+        else:
+            run_means = cube.run_means(metric, cube_rows)
+        avg_response_times = {col: run_means[col] for col in metric_cols}
         
         for run, avg in avg_response_times.items():
             st.write(f"**{run} Average Response Time:** {avg:.2f}")
         
         if avg_response_times:
-            best_run = min(avg_response_times, key=avg_response_times.get)
+            if summary_fields is not None and summary_fields['best_run'] in avg_response_times:
+                best_run = summary_fields['best_run']
+            else:
+                best_run = min(avg_response_times, key=avg_response_times.get)
             reason = f"{best_run} is the best because it has the lowest average response time of {avg_response_times[best_run]:.2f}."
             st.success(f"{best_run} has the best (lowest) response times overall. {reason}")
         else:
@@ -80,83 +430,155 @@ if df is not None:
     else:
         st.warning("Not enough data for response time comparison.")
     
+    # Baseline pinning: golden aggregates stored as compact arrays and diffed with one join
+    st.sidebar.subheader("Baseline")
+    baseline_name = st.sidebar.text_input("Baseline name", value=os.path.splitext(report_name)[0])
+    overwrite_baseline = st.sidebar.checkbox("Overwrite an existing baseline with this name", value=False)
+    if st.sidebar.button("Pin current report as baseline", disabled=not df_complete or not baseline_name):
+        try:
+            pinned_path = Baseline.from_cube(cube, baseline_name).save(overwrite=overwrite_baseline)
+            st.sidebar.success(f"Pinned baseline {os.path.basename(pinned_path)}")
+        except FileExistsError as exc:
+            st.sidebar.error(f"{exc} Tick the overwrite box to replace it.")
+    baseline_paths = list_baselines()
+    baseline_choice = st.sidebar.selectbox("Compare against baseline", [None] + baseline_paths,
+                                           format_func=lambda path: "—" if path is None else os.path.basename(path))
+    if baseline_choice is not None and metric_cols:
+        baseline = get_baseline(baseline_choice, os.path.getmtime(baseline_choice))
+        st.header(f"Baseline Comparison: {baseline.name}")
+        regression_pct = st.number_input("Regression threshold (%)", min_value=0.0, value=10.0, step=1.0)
+        baseline_diff = baseline.diff(cube, metric, cube_rows)
+        shown_runs = [col.split('-')[0] for col in metric_cols]
+        baseline_diff = baseline_diff[['TransactionName', 'Baseline'] + [col for run in shown_runs for col in (f'{run}-{metric}', f'{run} Δ%')]]
+        regressions = {run: int((baseline_diff[f'{run} Δ%'] > regression_pct).sum()) for run in shown_runs}
+        st.write(" | ".join(f"**{run}:** {count} regressed" for run, count in regressions.items()))
+        if baseline_diff['Baseline'].isna().all():
+            st.warning(f"Baseline has no {metric} values for these transactions.")
+        st.dataframe(baseline_diff, use_container_width=True)
+
+    # Rankings over the run matrix keep the default views small on huge reports
+    top_k = st.sidebar.number_input("Top-K transactions", min_value=1, max_value=500, value=DEFAULT_TOP_K)
+    rank_cols = [col for col in available_cols if 'Run' in col]
+    rankings = {}
+    if 'TransactionName' in filtered_view.columns and rank_cols:
+        rank_input = [col for col in ['TransactionName', 'SLA'] if col in filtered_view.columns] + rank_cols
+        rankings = cached_rankings(filtered_view.materialize(rank_input), rank_cols, top_k)
+
     # Section 5: SLA Compliance Indicator
-    if 'SLA' in filtered_df.columns:
-        st.header("SLA Compliance Indicator")
-        for run in ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']:
-            if run in filtered_df.columns:
-                filtered_df[f'SLA_Status_{run}'] = filtered_df.apply(lambda row: "✅" if row[run] <= row['SLA'] else "❌", axis=1)
-        st.dataframe(filtered_df)
+    if 'SLA' in filtered_view.columns:
+        with section_timer("Section 5: SLA table") as timing:
+            st.header("SLA Compliance Indicator")
+            if summary_fields is not None and summary_fields['sla_severity'] is not None:
+                severity, rule_hits = summary_fields['sla_severity'], {}
+            elif report_state is not None and rules_file is None and report_state.status:
+                # Each appended run's default SLA status was computed once by append_run; nothing is re-evaluated here
+                severity, rule_hits = report_state.sla_severity(cube, metric, cube_rows), {}
+                st.caption("Breaches per run (whole report): " +
+                           " | ".join(f"{col}: {count}" for col, count in report_state.sla_breaches(metric).items()))
+            else:
+                rule_set = rule_set or get_rule_set(rules_key, cube_key, metric, rules_spec, cube)
+                rule_columns = {col: filtered_view.values(col) for col in rule_set.required_columns() if col in filtered_view.columns}
+                severity, rule_hits = rule_set.evaluate(cube, cube_rows, rule_columns)
+            status_icons = np.array([STATUS_ICONS[level] for level in sorted(STATUS_ICONS)], dtype=object)
+            # Status columns ride along on the view instead of being written into a slice of df
+            filtered_view = filtered_view.with_columns({f'SLA_Status_{run}': status_icons[severity[:, cube.run_index[run.split('-')[0]]]]
+                                                        for run in metric_cols})
+            if rules_file is not None:
+                st.caption("Rule hits: " + ", ".join(f"{name}: {count}" for name, count in rule_hits.items()))
+                skipped_rules = rule_set.skipped_for(rule_columns)
+                if skipped_rules:
+                    st.caption("Skipped rules (metric or threshold column not in report): " + ", ".join(skipped_rules))
+            sla_view = filtered_view
+            if 'breaching' in rankings and len(filtered_view) > top_k and not st.checkbox("Show all transactions in SLA table", value=False):
+                sla_view = filtered_view.where_isin('TransactionName', rankings['breaching']['TransactionName'])
+                st.caption(f"Showing the {len(sla_view)} most breaching of {len(filtered_view)} transactions.")
+            timed_dataframe(note_frame('sla_df', sla_view), timing)
+
+    # Top-K slowest, most breaching and most regressed transactions
+    if rankings:
+        top_k_section(rankings, filtered_view, rank_cols)
     
+    # Full reruns rebuild the figures and slider-filtered view the fragments hand to Section 8
+    report_figures.clear()
+    st.session_state.pop('trend_view', None)
+
     # Section 6: Graphical Comparison
-    st.header("Graphical Comparison")
-    for run in ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']:
-        if run in filtered_df.columns:
-            fig = px.bar(filtered_df, x='TransactionName', y=run, title=f"{run} Response Time", color='TransactionName')
-            st.plotly_chart(fig, use_container_width=True)
+    with section_timer("Section 6: Per-run charts") as timing:
+        st.header("Graphical Comparison")
+        for run in metric_cols:
+            if run in filtered_view.columns:
+                fig = cached_figure(run_bar_chart, filtered_view.materialize(['TransactionName', run]), cache_if=builds_slowly, run=run)
+                timed_plotly_chart(fig, timing, use_container_width=True)
+                report_figures['comparison'] = fig
     
     # Additional Graph: Comparing response times in one graph
-    if 'TransactionName' in filtered_df.columns:
-        st.subheader("Graphical Comparison by Transaction")
-        transaction_options = filtered_df['TransactionName'].dropna().unique().tolist()
-        selected_transactions = st.multiselect("Select transactions to display in graph", transaction_options, default=transaction_options if transaction_options else [])
-        
-        if selected_transactions:
-            df_graph = filtered_df[filtered_df['TransactionName'].isin(selected_transactions)]
-            df_plot = df_graph.melt(id_vars='TransactionName', value_vars=[col for col in available_cols if 'Run' in col], var_name='Run', value_name='Response Time')
-            
-            if not df_plot.empty:
-                fig = px.bar(df_plot, x='TransactionName', y='Response Time', color='Run', barmode='group', title="Response Time Comparison per Transaction")
-                st.plotly_chart(fig, use_container_width=True)
+    if 'TransactionName' in filtered_view.columns:
+        transaction_comparison(filtered_view, available_cols)
     
     # Section 7: Performance Trend Analysis with Response Time Filtering
-    if 'TransactionName' in filtered_df.columns:
-        st.subheader("Performance Trend Analysis")
-        
-        for run_col in ['Run1-90Percent', 'Run2-90Percent', 'Run3-90Percent']:
-            if run_col in filtered_df.columns:
-                min_rt, max_rt = filtered_df[run_col].min(), filtered_df[run_col].max()
-                if min_rt != max_rt:
-                    selected_range = st.slider(f"Select {run_col} response time range", min_rt, max_rt, (min_rt, max_rt))
-                    filtered_df = filtered_df[(filtered_df[run_col] >= selected_range[0]) & (filtered_df[run_col] <= selected_range[1])]
-        
-        df_trend = filtered_df.melt(id_vars='TransactionName', value_vars=[col for col in available_cols if 'Run' in col], var_name='Run', value_name='Response Time')
-        
-        if not df_trend.empty:
-            fig_trend = px.line(df_trend, x='TransactionName', y='Response Time', color='Run', markers=True, title="Response Time Trend Over Runs")
-            st.plotly_chart(fig_trend, use_container_width=True)
-        else:
-            st.warning("No data available for trend analysis.")
+    if 'TransactionName' in filtered_view.columns:
+        known_trend = None
+        trend_cols = [col for col in available_cols if 'Run' in col]
+        if summary_fields is not None and set(summary_fields['run_means']) == set(trend_cols):
+            known_trend = summary_fields['trend']
+        elif report_state is not None and trend_cols:
+            known_trend = report_state.trend_frame(trend_cols, None if len(filtered_view) == len(df) else filtered_view.positions)
+        trend_analysis(filtered_view, available_cols, known_trend, scan)
     
+    # Sliders in Section 7 narrow the frame used by the report and the viewer
+    def report_frame():
+        return st.session_state.get('trend_view', filtered_view).materialize()
+
     # Section 8: Generate Word Report
     if st.sidebar.button("Generate Word Report"):
-        doc = Document()
-        doc.add_heading("Performance Report", level=1)
-        
-        doc.add_heading("Filtered Data Table", level=2)
-        if not filtered_df.empty:
-            table = doc.add_table(rows=1, cols=len(filtered_df.columns))
-            hdr_cells = table.rows[0].cells
-            for j, col in enumerate(filtered_df.columns):
-                hdr_cells[j].text = col
+        with section_timer("Section 8: Word report"), EXPORT_SECONDS.time(format="word"):
+            doc = Document()
+            doc.add_heading("Performance Report", level=1)
             
-            for i, row in filtered_df.iterrows():
-                row_cells = table.add_row().cells
-                for j, value in enumerate(row):
-                    row_cells[j].text = str(value)
-        
-        doc.add_heading("Graphs", level=2)
-        for fig in [fig, fig_trend]:
-            if fig:
-                img_stream = BytesIO()
-                fig.write_image(img_stream, format="png")
-                doc.add_picture(img_stream)
-        
-        doc.save("Performance_Report.docx")
-        st.sidebar.success("Word document generated: Performance_Report.docx")
+            doc.add_heading("Filtered Data Table", level=2)
+            report_df = report_frame()
+            if not report_df.empty:
+                table = doc.add_table(rows=1, cols=len(report_df.columns))
+                hdr_cells = table.rows[0].cells
+                for j, col in enumerate(report_df.columns):
+                    hdr_cells[j].text = col
+                
+                for i, row in report_df.iterrows():
+                    row_cells = table.add_row().cells
+                    for j, value in enumerate(row):
+                        row_cells[j].text = str(value)
+            
+            doc.add_heading("Graphs", level=2)
+            for fig in [report_figures.get('comparison'), report_figures.get('trend')]:
+                if fig:
+                    img_stream = BytesIO()
+                    fig.write_image(img_stream, format="png")
+                    doc.add_picture(img_stream)
+            
+            doc.save("Performance_Report.docx")
+            st.sidebar.success("Word document generated: Performance_Report.docx")
 
      # Section 9: View Downloaded Report
     
     if st.sidebar.button("View Downloaded Report"):
         st.write("Displaying the downloaded report:")
-        st.dataframe(filtered_df)
+        st.dataframe(report_frame())
+
+    show_rerun_log()
+
+# Server warm-up and request latency
+rerun_seconds = time.perf_counter() - run_started
+record_request(rerun_seconds * 1000)
+RERUN_SECONDS.observe(rerun_seconds)
+SESSION_BYTES.observe(governor.resident_bytes())
+with st.sidebar.expander("Session memory"):
+    budget_mb = st.number_input("Session budget (MB)", min_value=MIN_BUDGET_MB,
+                                value=max(governor.budget_bytes // 1024 ** 2, MIN_BUDGET_MB), step=64)
+    governor.budget_bytes = int(budget_mb) * 1024 ** 2
+    governor.enforce()
+    st.caption(f"Resident {governor.resident_bytes() / 1024 ** 2:.1f} MB, spilled {governor.spilled_bytes() / 1024 ** 2:.1f} MB, "
+               f"{governor.spills} spills, {governor.evictions} evictions")
+    st.dataframe(governor.entries(), hide_index=True)
+with st.sidebar.expander("Server warm-up"):
+    st.caption("Warm-up complete" if is_warm() else "Warm-up still running")
+    st.json(STARTUP)
@@ -3,6 +3,8 @@ import pandas as pd
 import plotly.express as px
 import matplotlib.pyplot as plt
 
+from report_loader import UPLOAD_TYPES, read_report
+
 #https://www.webfx.com/tools/emoji-cheat-sheet/
 st.set_page_config(page_title="Transaction Analyzer",
                    page_icon=":bar_chart:",
@@ -14,14 +16,11 @@ st.set_page_config(page_title="Transaction Analyzer",
 st.title("Performance Load Test Report Analysis")
                  
 
-uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx", "txt"])
+uploaded_file = st.file_uploader("Choose a file", type=UPLOAD_TYPES)
 
 if uploaded_file:
    # st.markdown('---')
-    dataset = pd.read_excel(
-    uploaded_file,
-    engine='openpyxl'   
-    )
+    dataset = read_report(uploaded_file, uploaded_file.name)
     st.dataframe(dataset)
    # st.sidebar.header("Please Filter Here:")
     st.write('### Summary Statistics')
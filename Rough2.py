@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+
+from report_loader import UPLOAD_TYPES, read_report
 #import matplotlib.pyplot as plt
 
 st.set_page_config(page_title="Transaction Analyzer",
@@ -7,10 +9,10 @@ st.set_page_config(page_title="Transaction Analyzer",
                    )
 
 # Load Excel file
-uploaded_file = st.file_uploader("Choose a file", type=["csv", "xlsx", "txt"])
+uploaded_file = st.file_uploader("Choose a file", type=UPLOAD_TYPES)
 
 if uploaded_file is not None:
-    df = pd.read_excel(uploaded_file, index_col=None)
+    df = read_report(uploaded_file, uploaded_file.name)
 
     # Streamlit app
     st.title("Data Query and Graph Generator")
@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_SAMPLE_BUDGET = 50_000
+MIN_PER_STRATUM = 50
+Z_95 = 1.96
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="exact-stats")
+
+
+def stratified_sample_indices(codes, per_stratum, seed=0):
+    # Same distribution as a per-stratum reservoir: the k rows with the smallest random keys in each stratum
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(codes)), codes))
+    counts = np.bincount(codes)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(codes)) - starts[codes[order]]
+    return order[rank < per_stratum]
+
+
+class ApproxSample:
+    def __init__(self, values, strata=None, budget=DEFAULT_SAMPLE_BUDGET, seed=0):
+        values = np.asarray(values, dtype=float)
+        keep = ~np.isnan(values)
+        values = values[keep]
+        if strata is None:
+            codes = np.zeros(len(values), dtype=np.int64)
+        else:
+            codes = np.unique(np.asarray(strata)[keep], return_inverse=True)[1]
+        n_strata = int(codes.max()) + 1 if len(codes) else 1
+        per_stratum = max(MIN_PER_STRATUM, budget // n_strata)
+
+        idx = stratified_sample_indices(codes, per_stratum, seed)
+        population = np.bincount(codes, minlength=n_strata)
+        sampled = np.bincount(codes[idx], minlength=n_strata)
+        self.values = values[idx]
+        self.codes = codes[idx]
+        # Each sampled row stands for N_h / n_h rows of its stratum
+        self.weights = (population / np.maximum(sampled, 1))[self.codes]
+        self.population = len(values)
+        self.minimum = float(values.min()) if len(values) else 0.0
+        self.maximum = float(values.max()) if len(values) else 0.0
+
+    def __len__(self):
+        return len(self.values)
+
+    def within(self, value_range):
+        mask = (self.values >= value_range[0]) & (self.values <= value_range[1])
+        return self.values[mask], self.weights[mask]
+
+
+def effective_size(weights):
+    total = weights.sum()
+    return total * total / np.square(weights).sum() if len(weights) else 0.0
+
+
+def mean_estimate(values, weights, population, z=Z_95):
+    if len(values) == 0:
+        return np.nan, np.nan, np.nan
+    mean = np.average(values, weights=weights)
+    n_eff = effective_size(weights)
+    variance = np.average(np.square(values - mean), weights=weights)
+    # Finite-population correction relative to the represented population
+    fpc = max(0.0, 1 - len(values) / max(population, 1))
+    half = z * np.sqrt(variance / max(n_eff, 1) * fpc)
+    return mean, mean - half, mean + half
+
+
+def percentile_estimate(values, weights, q, z=Z_95):
+    # Weighted quantile; interval from the binomial spread of the quantile's rank
+    if len(values) == 0:
+        return np.nan, np.nan, np.nan
+    order = np.argsort(values)
+    ordered, cdf = values[order], np.cumsum(weights[order]) / weights.sum()
+    spread = z * np.sqrt(q * (1 - q) / max(effective_size(weights), 1))
+    at = np.searchsorted(cdf, [q, max(q - spread, 0.0), min(q + spread, 1.0)]).clip(0, len(ordered) - 1)
+    return tuple(float(v) for v in ordered[at])
+
+
+def histogram_estimate(values, weights, edges, z=Z_95):
+    counts, _ = np.histogram(values, bins=edges, weights=weights)
+    total = weights.sum()
+    if total == 0:
+        return counts, np.zeros_like(counts)
+    share = counts / total
+    error = z * np.sqrt(share * (1 - share) / max(effective_size(weights), 1)) * total
+    return counts, error
+
+
+def exact_stats(values, value_range, edges):
+    values = np.asarray(values, dtype=float)
+    values = values[(values >= value_range[0]) & (values <= value_range[1])]
+    counts, _ = np.histogram(values, bins=edges)
+    if len(values) == 0:
+        return {'mean': np.nan, 'p90': np.nan, 'p95': np.nan, 'counts': counts}
+    p90, p95 = np.percentile(values, [90, 95])
+    return {'mean': float(values.mean()), 'p90': float(p90), 'p95': float(p95), 'counts': counts}
+
+
+def submit_exact(values, value_range, edges):
+    return _executor.submit(exact_stats, values, value_range, edges)
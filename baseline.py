@@ -0,0 +1,87 @@
+import json
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from report_cache import DEFAULT_CACHE_DIR
+
+
+class Baseline:
+    # Golden aggregates: per transaction and metric the median, min and max across the pinned runs
+    def __init__(self, name, transactions, metrics, values, low, high, meta=None):
+        self.name = name
+        self.transactions = transactions
+        self.metrics = list(metrics)
+        self.values = values
+        self.low = low
+        self.high = high
+        self.meta = meta or {}
+        self.metric_index = {metric: i for i, metric in enumerate(self.metrics)}
+
+    @classmethod
+    def from_cube(cls, cube, name):
+        _, first = np.unique(cube.transactions.astype(str), return_index=True)
+        first.sort()
+        data = cube._data[:, first, :]
+        # All-NaN rows (transaction missing from every run) are expected; silence their warnings
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            values = np.nanmedian(data, axis=2).T
+            low = np.nanmin(data, axis=2).T
+            high = np.nanmax(data, axis=2).T
+        meta = {'runs': list(cube.runs), 'pinned_at': time.time()}
+        return cls(name, cube.transactions[first].astype(str), cube.metrics,
+                   values.astype(np.float32), low.astype(np.float32), high.astype(np.float32), meta=meta)
+
+    def save(self, cache_dir=DEFAULT_CACHE_DIR, overwrite=False):
+        path = baseline_path(self.name, cache_dir)
+        if os.path.exists(path) and not overwrite:
+            raise FileExistsError(f"A baseline named {os.path.basename(path)} already exists.")
+        arrays = dict(transactions=self.transactions.astype(str), metrics=np.array(self.metrics, dtype=str),
+                      values=self.values, low=self.low, high=self.high,
+                      meta=np.array(json.dumps({'name': self.name, **self.meta})))
+        np.savez_compressed(path, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        # Plain arrays only; nothing is re-parsed and no pickles are loaded
+        with np.load(path, allow_pickle=False) as stored:
+            meta = json.loads(str(stored['meta']))
+            return cls(meta.pop('name'), stored['transactions'], stored['metrics'].tolist(),
+                       stored['values'], stored['low'], stored['high'], meta=meta)
+
+    def diff(self, cube, metric, rows=None):
+        # One vectorised join: baseline row position for every current transaction (-1 if unseen)
+        names = cube.transactions if rows is None else cube.transactions[rows]
+        positions = pd.Index(self.transactions).get_indexer(pd.Index(names).astype(str))
+        found = positions >= 0
+        base = np.full(len(names), np.nan, dtype=np.float32)
+        if metric in self.metric_index:
+            base[found] = self.values[positions[found], self.metric_index[metric]]
+
+        current = cube.metric(metric) if rows is None else cube.metric(metric)[rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = (current - base[:, None]) / base[:, None] * 100
+        result = pd.DataFrame({'TransactionName': names, 'Baseline': base})
+        for i, run in enumerate(cube.runs):
+            result[f'{run}-{metric}'] = current[:, i]
+            result[f'{run} Δ%'] = change[:, i].round(1)
+        return result
+
+
+def baseline_path(name, cache_dir=DEFAULT_CACHE_DIR):
+    folder = os.path.join(cache_dir, "baselines")
+    os.makedirs(folder, exist_ok=True)
+    safe = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in name)
+    return os.path.join(folder, f"{safe}.npz")
+
+
+def list_baselines(cache_dir=DEFAULT_CACHE_DIR):
+    folder = os.path.join(cache_dir, "baselines")
+    if not os.path.isdir(folder):
+        return []
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith('.npz'))
@@ -0,0 +1,110 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from report_pipeline import REPORT_SUFFIXES, analyze
+from report_schema import DEFAULT_METRIC
+
+try:
+    import dask.bag
+except ImportError:
+    dask = None
+
+
+def analyze_compact(path, metric=DEFAULT_METRIC):
+    # Workers run the dashboard pipeline and send back only aggregates, never the full frame
+    summary = analyze(path, metric)
+    cube = summary['cube']
+    row = {'report': summary['name'], 'path': path, 'error': None,
+           'transactions': summary['transactions'], 'best_run': summary['best_run']}
+    row.update({f'mean {col}': value for col, value in summary['run_means'].items()})
+    row.update({f'breaches {col}': count for col, count in summary['sla_breaches'].items()})
+
+    per_transaction = None
+    if metric in cube.metric_index and 'TransactionName' in summary['frame'].columns:
+        with np.errstate(all='ignore'):
+            values = np.nanmean(cube.metric(metric), axis=1) if cube.runs else np.full(len(cube.transactions), np.nan)
+        breached = (summary['sla_severity'] > 0).any(axis=1) if summary['sla_severity'] is not None else np.zeros(len(values), bool)
+        per_transaction = pd.DataFrame({'TransactionName': cube.transactions.astype(str), 'value': values.astype(np.float32),
+                                        'breached': breached})
+        per_transaction = per_transaction.groupby('TransactionName', sort=False).agg({'value': 'mean', 'breached': 'any'})
+    return row, per_transaction
+
+
+def _analyze_one(path):
+    # One unreadable report becomes a failure row instead of aborting the whole batch
+    try:
+        return analyze_compact(path)
+    except Exception as exc:
+        return {'report': os.path.basename(path), 'path': path, 'error': f"{type(exc).__name__}: {exc}"}, None
+
+
+def find_reports(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(REPORT_SUFFIXES))
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+
+def run_batch(paths, workers=None, backend='process'):
+    if backend == 'serial':
+        return [_analyze_one(path) for path in paths]
+    if backend == 'dask':
+        if dask is None:
+            raise RuntimeError("The dask backend requires the dask package.")
+        return dask.bag.from_sequence(paths, npartitions=len(paths) or 1).map(_analyze_one).compute(scheduler='processes', num_workers=workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # One report per task; chunking would only help for very small reports
+        return list(pool.map(_analyze_one, paths))
+
+
+def reduce_results(results):
+    reports = pd.DataFrame([row for row, _ in results])
+    # Keyed by path: nightly reports often share a file name across dated folders
+    frames = {row['path']: per_txn for row, per_txn in results if per_txn is not None}
+    if not frames:
+        return reports, pd.DataFrame()
+    values = pd.concat({name: frame['value'] for name, frame in frames.items()}, axis=1)
+    breached = pd.concat({name: frame['breached'] for name, frame in frames.items()}, axis=1)
+    transactions = pd.DataFrame({
+        'reports': values.notna().sum(axis=1),
+        'mean': values.mean(axis=1),
+        'min': values.min(axis=1),
+        'max': values.max(axis=1),
+        'worst_report': values.fillna(-np.inf).idxmax(axis=1),
+        'reports_breaching': breached.fillna(False).astype(bool).sum(axis=1),
+    })
+    return reports, transactions.sort_values('reports_breaching', ascending=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many reports in parallel and reduce them into one summary")
+    parser.add_argument("inputs", nargs='+', help="report files or directories")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--backend", choices=['process', 'dask', 'serial'], default='process')
+    parser.add_argument("--out", default="batch_summary", help="output prefix for the CSV files")
+    args = parser.parse_args()
+
+    paths = find_reports(args.inputs)
+    start = time.perf_counter()
+    reports, transactions = reduce_results(run_batch(paths, args.workers, args.backend))
+    elapsed = time.perf_counter() - start
+
+    reports.to_csv(f"{args.out}_reports.csv", index=False)
+    transactions.to_csv(f"{args.out}_transactions.csv")
+    print(f"Analyzed {len(paths)} reports in {elapsed:.2f}s -> {args.out}_reports.csv, {args.out}_transactions.csv")
+    failed = reports[reports['error'].notna()] if 'error' in reports.columns else reports.iloc[:0]
+    for _, row in failed.iterrows():
+        print(f"failed: {row['path']}: {row['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_backend import BACKENDS, get_backend
+
+
+def synthetic_report(transactions, runs, groups=50, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'TransactionName': [f'T{i:07d}' for i in range(transactions)],
+        'Group': rng.integers(0, groups, transactions).astype(str),
+        'SLA': rng.integers(500, 3000, transactions).astype(float),
+    })
+    for run in range(1, runs + 1):
+        frame[f'Run{run}-90Percent'] = rng.lognormal(6.5, 0.5, transactions)
+    return frame
+
+
+def pipeline(backend, source, run_cols, selected):
+    # The dashboard's two filters: rows by group value, then response time ranges over the surviving rows
+    rows = backend.filter_rows(source, 'Group', selected)
+    kept = backend.range_rows(source, {run_cols[0]: (500.0, 1500.0), run_cols[-1]: (300.0, 2500.0)}, rows)
+    return rows, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pandas vs Polars row and range filters")
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    df = synthetic_report(args.transactions, args.runs)
+    run_cols = [col for col in df.columns if col.startswith('Run')]
+    selected = [str(g) for g in range(0, 50, 2)]
+
+    results = {}
+    for name in BACKENDS:
+        backend = get_backend(name)
+        start = time.perf_counter()
+        source = backend.scan(df)
+        scanned = time.perf_counter() - start
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = pipeline(backend, source, run_cols, selected)
+            timings.append(time.perf_counter() - start)
+        print(f"{name:7s} scan {scanned:6.2f}s  pipeline best {min(timings):6.2f}s  mean {np.mean(timings):6.2f}s")
+
+    if 'polars' in results:
+        for pandas_rows, polars_rows in zip(results['pandas'], results['polars']):
+            np.testing.assert_array_equal(pandas_rows, polars_rows)
+        print("pandas and polars results match")
+    else:
+        print("polars is not installed; only the pandas backend was measured")
+
+
+if __name__ == '__main__':
+    main()
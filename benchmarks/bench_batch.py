@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_analysis import reduce_results, run_batch
+
+
+def write_reports(folder, count, transactions, runs, seed=0):
+    rng = np.random.default_rng(seed)
+    names = [f'T{i:05d}_Transaction' for i in range(transactions)]
+    paths = []
+    for i in range(count):
+        frame = pd.DataFrame({'TransactionName': names, 'SLA': rng.integers(500, 3000, transactions)})
+        for run in range(1, runs + 1):
+            frame[f'Run{run}-90Percent'] = rng.lognormal(6.5, 0.5, transactions).round(1)
+        path = os.path.join(folder, f'report_{i:04d}.csv')
+        frame.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling of batch_analysis with worker count")
+    parser.add_argument('--reports', type=int, default=64)
+    parser.add_argument('--transactions', type=int, default=20_000)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count()])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_reports(folder, args.reports, args.transactions, args.runs)
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            reduce_results(run_batch(paths, workers))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{workers:3d} workers  {elapsed:7.2f}s  speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from kernels import HAVE_NUMBA, group_offsets, grouped_breach_count, grouped_histogram, grouped_percentile, sort_by_group
+
+
+def synthetic_latencies(n, n_groups, nan_fraction, seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, n_groups, n).astype(np.int32)
+    values = rng.lognormal(5, 0.6, n).astype(np.float32)
+    values[rng.random(n) < nan_fraction] = np.nan
+    return codes, values
+
+
+def reference(codes, values, n_groups, q):
+    # One np.nanpercentile per group: slow, but independent of the kernels' sort and offsets
+    out = np.full(n_groups, np.nan)
+    for g in range(n_groups):
+        group = values[codes == g]
+        if np.isfinite(group).any():
+            out[g] = np.nanpercentile(group.astype(np.float64), q * 100)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grouped percentile, breach-count and histogram kernels: Numba vs NumPy")
+    parser.add_argument('--samples', type=int, default=5_000_000)
+    parser.add_argument('--groups', type=int, default=500)
+    parser.add_argument('--nan-fraction', type=float, default=0.001)
+    parser.add_argument('--check-groups', type=int, default=50,
+                        help="Groups also checked against np.nanpercentile")
+    args = parser.parse_args()
+
+    codes, values = synthetic_latencies(args.samples, args.groups, args.nan_fraction)
+    start = time.perf_counter()
+    sorted_codes, sorted_values = sort_by_group(codes, values)
+    offsets = group_offsets(sorted_codes, args.groups)
+    print(f"sort      {time.perf_counter() - start:6.2f}s")
+
+    thresholds = np.linspace(100.0, 300.0, args.groups)
+    edges = np.geomspace(1, 1e4, 41)
+    paths = {'numpy': False}
+    if HAVE_NUMBA:
+        # The first calls compile; time the second
+        grouped_percentile(sorted_values, offsets, 0.9, use_numba=True)
+        grouped_breach_count(sorted_values, offsets, thresholds, use_numba=True)
+        grouped_histogram(sorted_values, offsets, edges, use_numba=True)
+        paths['numba'] = True
+    results, counts = {}, {}
+    for name, use_numba in paths.items():
+        start = time.perf_counter()
+        results[name] = {q: grouped_percentile(sorted_values, offsets, q, use_numba=use_numba) for q in (0.5, 0.9, 0.99)}
+        counts[name] = (grouped_breach_count(sorted_values, offsets, thresholds, use_numba=use_numba),
+                        grouped_histogram(sorted_values, offsets, edges, use_numba=use_numba))
+        print(f"{name:9s} {time.perf_counter() - start:6.2f}s")
+
+    expected_breaches = np.bincount(sorted_codes, weights=sorted_values > thresholds[sorted_codes], minlength=args.groups)
+    expected_histogram = np.stack([np.histogram(sorted_values[sorted_codes == g], bins=edges)[0] for g in range(args.groups)])
+    for name, (breaches, histogram) in counts.items():
+        np.testing.assert_array_equal(breaches, expected_breaches)
+        np.testing.assert_array_equal(histogram, expected_histogram)
+
+    for q, got in results['numpy'].items():
+        assert not np.isnan(got).any(), f"NaN percentile at q={q}"
+        if 'numba' in results:
+            np.testing.assert_allclose(results['numba'][q], got, rtol=1e-6)
+        checked = min(args.check_groups, args.groups)
+        keep = codes < checked
+        np.testing.assert_allclose(got[:checked], reference(codes[keep], values[keep], checked, q), rtol=1e-5)
+    print("numba and numpy results match" if 'numba' in results else
+          "numba is not installed; numpy results match np.nanpercentile")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_parsers import parse_jtl_csv, parse_jtl_xml, parse_k6_json, aggregate_samples
+
+
+def synthetic_samples(n, n_labels, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timeStamp': 1_700_000_000_000 + np.arange(n, dtype=np.int64) * 5,
+        'elapsed': rng.lognormal(5, 0.6, n).astype(np.int64),
+        'label': np.array([f'T{i:04d}_Transaction' for i in range(n_labels)])[rng.integers(0, n_labels, n)],
+        'responseCode': 200,
+        'success': rng.random(n) > 0.01,
+    })
+
+
+def jtl_csv_bytes(frame):
+    return frame.to_csv(index=False).encode()
+
+
+def jtl_xml_bytes(frame):
+    out = io.StringIO()
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n<testResults version="1.2">\n')
+    for ts, t, lb, s in zip(frame['timeStamp'], frame['elapsed'], frame['label'], frame['success']):
+        out.write(f'<httpSample t="{t}" ts="{ts}" lb="{lb}" s="{str(s).lower()}"/>\n')
+    out.write('</testResults>\n')
+    return out.getvalue().encode()
+
+
+def k6_json_bytes(frame):
+    times = pd.to_datetime(frame['timeStamp'], unit='ms', utc=True).dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+    lines = (
+        json.dumps({'type': 'Point', 'metric': 'http_req_duration',
+                    'data': {'time': when, 'value': float(t), 'tags': {'name': lb, 'expected_response': str(s).lower()}}})
+        for when, t, lb, s in zip(times, frame['elapsed'], frame['label'], frame['success'])
+    )
+    return ('\n'.join(lines) + '\n').encode()
+
+
+def bench(name, parser, payload, n):
+    start = time.perf_counter()
+    samples = parser(io.BytesIO(payload))
+    parsed = time.perf_counter()
+    aggregate_samples(samples)
+    done = time.perf_counter()
+    print(f"{name:10s} {n:>12,d} samples  parse {parsed - start:7.2f}s  aggregate {done - parsed:6.3f}s  "
+          f"{n / (done - start):>14,.0f} samples/s  ({len(payload) / 1e6:,.0f} MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the raw load-test result parsers")
+    parser.add_argument('--samples', type=int, default=2_000_000)
+    parser.add_argument('--labels', type=int, default=500)
+    parser.add_argument('--formats', nargs='+', default=['jtl-csv', 'jtl-xml', 'k6-json'])
+    args = parser.parse_args()
+
+    frame = synthetic_samples(args.samples, args.labels)
+    builders = {
+        'jtl-csv': (jtl_csv_bytes, parse_jtl_csv),
+        'jtl-xml': (jtl_xml_bytes, parse_jtl_xml),
+        'k6-json': (k6_json_bytes, parse_k6_json),
+    }
+    for name in args.formats:
+        to_bytes, parse = builders[name]
+        bench(name, parse, to_bytes(frame), args.samples)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_backends import synthetic_report
+from frame_view import FrameView
+
+
+def copying_chain(df, columns, selected, run_cols):
+    # The previous IndexP8 flow: every step materialises a new frame
+    filtered = df[df['Group'].isin(selected)][columns]
+    for run in run_cols:
+        filtered[f'SLA_Status_{run}'] = np.where(filtered[run] > filtered['SLA'], "breach", "ok")
+    for run in run_cols[:3]:
+        filtered = filtered[(filtered[run] >= 500.0) & (filtered[run] <= 1500.0)]
+    return filtered[['TransactionName', *run_cols]]
+
+
+def view_chain(df, columns, selected, run_cols):
+    view = FrameView(df, np.flatnonzero(df['Group'].isin(selected).to_numpy()), columns)
+    sla = view.values('SLA')
+    view = view.with_columns({f'SLA_Status_{run}': np.where(view.values(run) > sla, "breach", "ok") for run in run_cols})
+    for run in run_cols[:3]:
+        view = view.where_between(run, 500.0, 1500.0)
+    return view.materialize(['TransactionName', *run_cols])
+
+
+def measure(chain, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = chain(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Copying filter chain vs frame views")
+    parser.add_argument('--transactions', type=int, default=1_000_000)
+    parser.add_argument('--runs', type=int, default=40)
+    args = parser.parse_args()
+
+    df = synthetic_report(args.transactions, args.runs)
+    run_cols = [col for col in df.columns if col.startswith('Run')]
+    columns = ['TransactionName', 'SLA', *run_cols]
+    selected = [str(g) for g in range(0, 50, 2)]
+
+    results = {}
+    for name, chain in [("copy", copying_chain), ("view", view_chain)]:
+        results[name], elapsed, peak = measure(chain, df, columns, selected, run_cols)
+        print(f"{name:5s} {elapsed:6.2f}s  peak {peak / 1024 ** 2:8.1f} MB")
+
+    pd.testing.assert_frame_equal(results['copy'], results['view'])
+    print("results match")
+
+
+if __name__ == '__main__':
+    main()
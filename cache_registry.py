@@ -0,0 +1,298 @@
+import functools
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import streamlit as st
+
+# Depth limit when sizing nested containers and plain objects
+SIZE_DEPTH = 4
+
+
+def estimate_bytes(value, depth=0):
+    # Shallow for pandas and NumPy (buffers only), recursive for containers; good enough to rank caches
+    if value is None or depth > SIZE_DEPTH:
+        return 0
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if hasattr(value, 'memory_usage') and hasattr(value, 'index'):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(getattr(value, 'nbytes', None), (int, np.integer)):
+        return int(value.nbytes)
+    if isinstance(value, Future):
+        return estimate_bytes(value.result(), depth + 1) if value.done() and not value.exception() else 0
+    if isinstance(value, dict):
+        return sum(estimate_bytes(item, depth + 1) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(estimate_bytes(item, depth + 1) for item in value)
+    if hasattr(value, '__dict__') and not inspect.isroutine(value) and not inspect.ismodule(value):
+        return sum(estimate_bytes(item, depth + 1) for item in vars(value).values())
+    return sys.getsizeof(value)
+
+
+def describe(value):
+    if hasattr(value, 'shape'):
+        return f"{type(value).__name__}{tuple(value.shape)}"
+    if hasattr(value, 'name') and hasattr(value, 'size'):
+        return f"{value.name}:{value.size}"
+    text = repr(value)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+
+class _Entry:
+    __slots__ = ('value', 'nbytes', 'created', 'accessed', 'hits')
+
+    def __init__(self, value=None, nbytes=0):
+        self.value = value
+        self.nbytes = nbytes
+        self.created = self.accessed = time.time()
+        self.hits = 0
+
+
+class CacheLayer:
+    # Common bookkeeping for every cache the admin page can see; subclasses decide how entries are dropped
+    kind = None
+
+    def __init__(self, name, ttl=None, max_bytes=None, max_entries=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _size(self, entry):
+        return entry.nbytes
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._size(entry) for entry in self._entries.values())
+
+    def entries(self):
+        now = time.time()
+        with self._lock:
+            return [{'key': describe(key) if not isinstance(key, str) else key, 'bytes': self._size(entry),
+                     'hits': entry.hits, 'age_s': round(now - entry.created, 1),
+                     'idle_s': round(now - entry.accessed, 1)}
+                    for key, entry in self._entries.items()]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'cache': self.name, 'kind': self.kind, 'entries': len(self._entries), 'bytes': self.total_bytes(),
+                    'hits': self.hits, 'misses': self.misses,
+                    'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                    'evictions': self.evictions, 'ttl_s': self.ttl, 'max_bytes': self.max_bytes,
+                    'max_entries': self.max_entries}
+
+    def set_policy(self, ttl=None, max_bytes=None):
+        self.ttl = ttl or None
+        self.max_bytes = max_bytes or None
+        self.enforce()
+
+    def _expired(self, entry, now):
+        return self.ttl is not None and now - entry.created > self.ttl
+
+    def enforce(self):
+        raise NotImplementedError
+
+    def purge(self, key=None):
+        raise NotImplementedError
+
+
+class ManagedCache(CacheLayer):
+    # In-process LRU owned by the app; entries can be dropped one at a time
+    kind = "managed"
+
+    def __init__(self, name, ttl=None, max_bytes=None, max_entries=None, sizer=estimate_bytes):
+        super().__init__(name, ttl, max_bytes, max_entries)
+        self.sizer = sizer
+        CACHES.register(self)
+
+    def _size(self, entry):
+        # Values such as in-flight loads grow after insertion, so they are sized when asked
+        return self.sizer(entry.value)
+
+    def peek(self, key, default=None):
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, time.time()):
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            entry.accessed = time.time()
+            self.hits += 1
+            return entry.value
+
+    def put(self, key, value):
+        if self.max_bytes is not None and self.sizer(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = _Entry(value)
+            self.enforce()
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self.evictions += 1
+
+    def enforce(self):
+        with self._lock:
+            now = time.time()
+            for key in [key for key, entry in self._entries.items() if self._expired(entry, now)]:
+                self._drop(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+            if self.max_bytes is not None:
+                total = self.total_bytes()
+                while self._entries and total > self.max_bytes:
+                    key, entry = next(iter(self._entries.items()))
+                    total -= self._size(entry)
+                    self._drop(key)
+
+    def purge(self, key=None):
+        with self._lock:
+            if key is None:
+                self.evictions += len(self._entries)
+                self._entries.clear()
+            else:
+                for stored in [stored for stored in self._entries if stored == key or describe(stored) == key]:
+                    self._drop(stored)
+
+    def clear(self):
+        self.purge()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class StreamlitCache(CacheLayer):
+    # Mirrors an st.cache_data/st.cache_resource function. Streamlit only clears a function's cache as a whole,
+    # so TTL/max-bytes breaches and purges drop every entry
+    def __init__(self, name, kind, max_entries=None):
+        super().__init__(name, max_entries=max_entries)
+        self.kind = kind
+        self.clear_func = None
+
+    def record(self, key, result, missed):
+        with self._lock:
+            entry = self._entries.get(key)
+            if missed or entry is None:
+                self._entries.pop(key, None)
+                self._entries[key] = _Entry(nbytes=estimate_bytes(result))
+                if missed:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                while self.max_entries is not None and len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            else:
+                self._entries.move_to_end(key)
+                entry.hits += 1
+                entry.accessed = time.time()
+                self.hits += 1
+
+    def enforce(self):
+        now = time.time()
+        with self._lock:
+            expired = any(self._expired(entry, now) for entry in self._entries.values())
+            oversized = self.max_bytes is not None and self.total_bytes() > self.max_bytes
+        if expired or oversized:
+            self.purge()
+
+    def purge(self, key=None):
+        with self._lock:
+            self.evictions += len(self._entries)
+            self._entries.clear()
+        if self.clear_func is not None:
+            self.clear_func()
+
+
+class CacheRegistry:
+    def __init__(self):
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, layer):
+        # Re-registering a name (script reruns redefine cached functions) replaces the old layer
+        with self._lock:
+            previous = self._layers.get(layer.name)
+            if previous is not None and previous is not layer and type(previous) is type(layer):
+                layer.hits, layer.misses, layer.evictions = previous.hits, previous.misses, previous.evictions
+                layer.ttl, layer.max_bytes = previous.ttl, previous.max_bytes
+                layer._entries = previous._entries
+            self._layers[layer.name] = layer
+        return layer
+
+    def layers(self):
+        with self._lock:
+            return list(self._layers.values())
+
+    def get(self, name):
+        return self._layers.get(name)
+
+    def stats(self):
+        return [layer.stats() for layer in self.layers()]
+
+    def purge_all(self):
+        for layer in self.layers():
+            layer.purge()
+
+
+# One registry per server process, shared by every session and page
+CACHES = CacheRegistry()
+_calls = threading.local()
+
+
+def registered_cache(name, kind="data", **cache_kwargs):
+    # Drop-in for @st.cache_data / @st.cache_resource that reports entries, sizes and hit counts to CACHES.
+    # Entry keys mirror Streamlit's: underscore-prefixed arguments are left out
+    decorator = st.cache_data if kind == "data" else st.cache_resource
+
+    def wrap(func):
+        signature = inspect.signature(func)
+        layer = StreamlitCache(name, kind, max_entries=cache_kwargs.get('max_entries'))
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            _calls.missed = True
+            return func(*args, **kwargs)
+
+        cached = decorator(**cache_kwargs)(compute)
+        layer.clear_func = cached.clear
+        CACHES.register(layer)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            key = tuple(describe(value) for param, value in bound.arguments.items() if not param.startswith('_'))
+            # Nested cached calls share the thread-local flag, so the caller's value is restored afterwards
+            outer, _calls.missed = getattr(_calls, 'missed', False), False
+            result = cached(*args, **kwargs)
+            missed, _calls.missed = _calls.missed, outer
+            CACHES.get(name).record(key, result, missed)
+            CACHES.get(name).enforce()
+            return result
+
+        call.clear = lambda: CACHES.get(name).purge()
+        return call
+    return wrap
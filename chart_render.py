@@ -0,0 +1,70 @@
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many transactions, charts switch to a constant number of traces
+CATEGORY_THRESHOLD = 100
+
+
+def many_categories(data, column='TransactionName', threshold=CATEGORY_THRESHOLD):
+    return data[column].nunique() > threshold
+
+
+def builds_slowly(data, threshold=CATEGORY_THRESHOLD):
+    # Only the per-transaction trace figures are worth caching; the single-trace and WebGL figures
+    # used above the threshold build faster than plotly.io rebuilds them from cached JSON
+    return not many_categories(data, threshold=threshold)
+
+
+def run_bar_chart(data, run, threshold=CATEGORY_THRESHOLD):
+    title = f"{run} Response Time"
+    if not many_categories(data, threshold=threshold):
+        return px.bar(data, x='TransactionName', y=run, title=title, color='TransactionName')
+    # One trace coloured by transaction code instead of one trace per transaction
+    codes, _ = pd.factorize(data['TransactionName'])
+    fig = go.Figure(go.Bar(
+        x=data['TransactionName'], y=data[run],
+        marker=dict(color=codes, colorscale='Turbo'),
+        hovertemplate="%{x}<br>%{y}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title='TransactionName', yaxis_title=run)
+    return fig
+
+
+def trend_line_chart(data, run_cols, threshold=CATEGORY_THRESHOLD, melted=None):
+    # melted: the long-format trend already computed for this data (e.g. a precomputed report summary)
+    title = "Response Time Trend Over Runs"
+    run_cols = list(run_cols)
+    if data.empty or not run_cols:
+        return None
+    if not many_categories(data, threshold=threshold):
+        df_trend = melted if melted is not None else data.melt(id_vars='TransactionName', value_vars=run_cols, var_name='Run', value_name='Response Time')
+        return px.line(df_trend, x='TransactionName', y='Response Time', color='Run', markers=True, title=title)
+    # WebGL lines, one per run
+    fig = go.Figure([
+        go.Scattergl(x=data['TransactionName'], y=data[col], mode='lines+markers', name=col)
+        for col in run_cols
+    ])
+    fig.update_layout(title=title, xaxis_title='TransactionName', yaxis_title='Response Time', legend_title_text='Run')
+    return fig
+
+
+def run_heatmap(data, run_cols, title="Response Time by Transaction and Run"):
+    run_cols = list(run_cols)
+    fig = go.Figure(go.Heatmap(
+        z=data[run_cols].to_numpy().T, x=data['TransactionName'], y=run_cols,
+        colorscale='RdYlGn_r', colorbar=dict(title='Response Time'),
+    ))
+    fig.update_layout(title=title, xaxis_title='TransactionName', yaxis_title='Run')
+    return fig
+
+
+def comparison_chart(data, run_cols, barmode='group', title="Response Time Comparison per Transaction", threshold=CATEGORY_THRESHOLD):
+    # Wide comparisons become a transaction x run heatmap
+    run_cols = list(run_cols)
+    if data.empty or not run_cols:
+        return None
+    if many_categories(data, threshold=threshold):
+        return run_heatmap(data, run_cols, title=title)
+    df_plot = data.melt(id_vars='TransactionName', value_vars=run_cols, var_name='Run', value_name='Response Time')
+    return px.bar(df_plot, x='TransactionName', y='Response Time', color='Run', barmode=barmode, title=title)
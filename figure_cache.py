@@ -0,0 +1,44 @@
+import hashlib
+
+import pandas as pd
+import plotly.io as pio
+
+from cache_registry import ManagedCache
+from metrics import FIGURE_CACHE, FIGURE_SECONDS
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache(ManagedCache):
+    # Serialised figure JSON keyed on (builder, data fingerprint, chart parameters), evicted least-recently-used
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, name="figures"):
+        super().__init__(name, max_bytes=max_bytes, sizer=len)
+
+
+figure_cache = FigureCache()
+
+
+def frame_fingerprint(df):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def cached_figure(builder, df, cache=figure_cache, cache_if=None, **params):
+    # cache_if(df) False: the builder is cheaper than hashing df and rebuilding the figure from JSON, so skip the cache
+    if cache_if is not None and not cache_if(df):
+        with FIGURE_SECONDS.time(builder=builder.__qualname__):
+            return builder(df, **params)
+    key = (builder.__module__, builder.__qualname__, frame_fingerprint(df), repr(sorted(params.items())))
+    spec = cache.get(key)
+    if spec is not None:
+        FIGURE_CACHE.inc(result="hit")
+        return pio.from_json(spec)
+    FIGURE_CACHE.inc(result="miss")
+    with FIGURE_SECONDS.time(builder=builder.__qualname__):
+        fig = builder(df, **params)
+    if fig is None:
+        return None
+    cache.put(key, fig.to_json())
+    return fig
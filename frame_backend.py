@@ -0,0 +1,95 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+ROW_ID = "__row__"
+
+
+def _arrow_safe(series):
+    # Spreadsheet columns often mix numbers and text, which Arrow cannot type; those become strings
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True).startswith('mixed'):
+        return series.where(series.isna(), series.astype(str))
+    return series
+
+
+# Both backends answer with row positions into the scanned frame, so results slot straight into a FrameView
+
+class PandasBackend:
+    name = "pandas"
+
+    def scan(self, df):
+        return df
+
+    def filter_rows(self, source, logical_column=None, selected_vals=None):
+        if logical_column is None or logical_column not in source.columns:
+            return None
+        return np.flatnonzero(source[logical_column].isin(selected_vals).to_numpy())
+
+    def range_rows(self, source, ranges, rows=None):
+        # Positions (within rows, if given) whose values lie inside every inclusive (low, high) range
+        positions = np.arange(len(source)) if rows is None else np.asarray(rows, dtype=np.intp)
+        keep = np.ones(len(positions), dtype=bool)
+        for col, (low, high) in ranges.items():
+            values = source[col].to_numpy()[positions]
+            keep &= (values >= low) & (values <= high)
+        return positions[keep]
+
+
+class PolarsScan:
+    # Columns are converted to Arrow on first use, so filtering on one column never copies the whole report
+    def __init__(self, df):
+        self.df = df
+        self.columns = {}
+        self._lock = threading.Lock()
+
+    def lazy(self, cols):
+        with self._lock:
+            for col in cols:
+                if col not in self.columns:
+                    self.columns[col] = pl.from_pandas(_arrow_safe(self.df[col]).reset_index(drop=True)).alias(col)
+            return pl.DataFrame([self.columns[col] for col in cols]).lazy().with_row_index(ROW_ID)
+
+
+class PolarsBackend:
+    # Lazy plans let Polars push the predicates down and run them multi-threaded
+    name = "polars"
+
+    def scan(self, df):
+        return PolarsScan(df)
+
+    def _positions(self, plan):
+        return plan.select(pl.col(ROW_ID).cast(pl.Int64)).collect()[ROW_ID].to_numpy()
+
+    def filter_rows(self, source, logical_column=None, selected_vals=None):
+        if logical_column is None or logical_column not in source.df.columns:
+            return None
+        plan = source.lazy([logical_column])
+        values = list(selected_vals)
+        if source.columns[logical_column].dtype == pl.Utf8:
+            # Mixed columns were stringified by the scan, so the selected values are matched as strings too
+            values = [str(value) for value in values]
+        plan = plan.filter(pl.col(logical_column).is_in(values))
+        return self._positions(plan)
+
+    def range_rows(self, source, ranges, rows=None):
+        plan = source.lazy(list(ranges))
+        if rows is not None:
+            plan = plan.filter(pl.col(ROW_ID).is_in(pl.Series(np.asarray(rows, dtype=np.int64)).cast(pl.UInt32)))
+        for col, (low, high) in ranges.items():
+            plan = plan.filter(pl.col(col).is_between(low, high))
+        return self._positions(plan)
+
+
+BACKENDS = {"pandas": PandasBackend}
+if pl is not None:
+    BACKENDS["polars"] = PolarsBackend
+
+
+def get_backend(name="pandas"):
+    return BACKENDS[name]()
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+
+class FrameView:
+    # Row positions and a column projection over a shared base frame, plus derived columns kept as arrays.
+    # Filtering and projecting only build position arrays; materialize() makes the one copy a render or export needs.
+    # The base frame is never written to, so views can be shared between sections and reruns.
+    __slots__ = ('base', 'rows', 'cols', 'extra', '__weakref__')
+
+    def __init__(self, base, rows=None, cols=None, extra=None):
+        self.base = base
+        self.rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+        self.cols = list(base.columns) if cols is None else list(cols)
+        self.extra = extra or {}
+
+    def __len__(self):
+        return len(self.base) if self.rows is None else len(self.rows)
+
+    @property
+    def columns(self):
+        return self.cols
+
+    @property
+    def empty(self):
+        return len(self) == 0 or not self.cols
+
+    @property
+    def positions(self):
+        return np.arange(len(self.base)) if self.rows is None else self.rows
+
+    @property
+    def index(self):
+        return self.base.index if self.rows is None else self.base.index[self.rows]
+
+    @property
+    def nbytes(self):
+        return (0 if self.rows is None else self.rows.nbytes) + sum(values.nbytes for values in self.extra.values())
+
+    def values(self, col):
+        if col in self.extra:
+            return self.extra[col]
+        values = self.base[col].to_numpy()
+        return values if self.rows is None else values[self.rows]
+
+    def unique(self, col, dropna=True):
+        values = pd.unique(self.values(col))
+        return values[~pd.isna(values)] if dropna else values
+
+    def select(self, mask):
+        mask = np.asarray(mask, dtype=bool)
+        return FrameView(self.base, self.positions[mask], self.cols,
+                         {col: values[mask] for col, values in self.extra.items()})
+
+    def where_isin(self, col, values):
+        return self.select(pd.Series(self.values(col)).isin(values).to_numpy())
+
+    def where_between(self, col, low, high):
+        values = self.values(col)
+        return self.select((values >= low) & (values <= high))
+
+    def project(self, cols):
+        cols = list(cols)
+        return FrameView(self.base, self.rows, cols, {col: values for col, values in self.extra.items() if col in cols})
+
+    def with_columns(self, columns):
+        # Derived columns live beside the base instead of being assigned into a (possibly shared) frame
+        extra = dict(self.extra)
+        extra.update({col: np.asarray(values) for col, values in columns.items()})
+        return FrameView(self.base, self.rows, self.cols + [col for col in columns if col not in self.cols], extra)
+
+    def materialize(self, cols=None):
+        # An unfiltered, unprojected view returns the shared base frame itself (no copy); callers must not mutate it
+        cols = self.cols if cols is None else list(cols)
+        base_cols = [col for col in cols if col not in self.extra]
+        positions = self.base.columns.get_indexer(base_cols)
+        if (positions < 0).any():
+            raise KeyError(f"Columns not in frame: {[col for col, pos in zip(base_cols, positions) if pos < 0]}")
+        if self.rows is None and len(base_cols) == len(cols) and base_cols == list(self.base.columns):
+            return self.base
+        if self.rows is None:
+            frame = self.base.copy(deep=False) if base_cols == list(self.base.columns) else self.base[base_cols]
+        else:
+            frame = self.base.iloc[self.rows, positions]
+        if len(base_cols) < len(cols):
+            # A shallow copy owns its column list, so adding the derived columns never touches the base
+            frame = frame.copy(deep=False)
+            for col in cols:
+                if col in self.extra:
+                    frame[col] = self.extra[col]
+        return frame if list(frame.columns) == cols else frame[cols]
+
+    @classmethod
+    def from_frame(cls, frame):
+        return cls(frame)
@@ -0,0 +1,47 @@
+import numpy as np
+import plotly.graph_objects as go
+
+from cache_registry import registered_cache
+
+
+def smallest_positive(values, high=np.inf):
+    positive = values[(values > 0) & (values <= high)]
+    return float(positive.min()) if len(positive) else None
+
+
+def bin_edges(low, high, bins=50, log=False, positive_low=None):
+    if log:
+        if low <= 0:
+            # Log bins cannot start at zero; start at the smallest positive value so the bins cover the data,
+            # not hundreds of decades of empty space above float tiny
+            low = positive_low if positive_low is not None else (high * 1e-6 if high > 0 else 1.0)
+        high = max(high, low * 1.000001)
+        return np.geomspace(low, high, bins + 1)
+    if high <= low:
+        high = low + 1.0
+    return np.linspace(low, high, bins + 1)
+
+
+# Underscored values are not hashed by Streamlit; dataset_key identifies them instead
+@registered_cache("histograms", max_entries=256, show_spinner=False)
+def histogram_counts(_values, dataset_key, value_range, bins=50, log=False):
+    positive_low = smallest_positive(_values, value_range[1]) if log and value_range[0] <= 0 else None
+    edges = bin_edges(value_range[0], value_range[1], bins, log, positive_low)
+    counts, _ = np.histogram(_values, bins=edges)
+    return edges, counts
+
+
+def histogram_figure(series, title, log=False, x_title="response_time"):
+    # series: (name, edges, counts[, error]) per run; only edges and counts reach the browser
+    fig = go.Figure()
+    for name, edges, counts, *error in series:
+        fig.add_trace(go.Bar(
+            x=(edges[:-1] + edges[1:]) / 2 if not log else np.sqrt(edges[:-1] * edges[1:]),
+            y=counts, width=np.diff(edges), name=name,
+            opacity=0.6 if len(series) > 1 else 1.0,
+            error_y=dict(type='data', array=error[0]) if error else None,
+        ))
+    fig.update_layout(title=title, barmode='overlay', bargap=0, xaxis_title=x_title, yaxis_title='count')
+    if log:
+        fig.update_xaxes(type='log')
+    return fig
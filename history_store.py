@@ -0,0 +1,115 @@
+import sqlite3
+import threading
+import uuid
+from datetime import date
+
+import pandas as pd
+
+from report_schema import run_columns
+
+DEFAULT_DB_PATH = "perf_history.db"
+# SQLite caps bound parameters; larger selections are joined against a temp table instead
+MAX_IN_PARAMS = 900
+TREND_COLUMNS = ['TransactionName', 'run_date', 'response_time', 'sla']
+
+# The store's connection is shared by every session, so multi-statement work is serialised
+_lock = threading.Lock()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    TransactionName TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    run_label TEXT NOT NULL,
+    response_time REAL,
+    sla REAL,
+    report_name TEXT,
+    PRIMARY KEY (TransactionName, run_date, run_label)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_txn_date ON runs (TransactionName, run_date);
+CREATE INDEX IF NOT EXISTS idx_runs_date ON runs (run_date);
+"""
+
+
+def open_store(path=DEFAULT_DB_PATH):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def ingest_report(conn, df, run_date, report_name=None):
+    # One row per (transaction, date, run column); re-ingesting a date replaces it
+    runs = run_columns(df.columns)
+    if 'TransactionName' not in df.columns or not runs:
+        return 0
+    if isinstance(run_date, date):
+        run_date = run_date.isoformat()
+
+    id_vars = ['TransactionName'] + (['SLA'] if 'SLA' in df.columns else [])
+    long_df = df.melt(id_vars=id_vars, value_vars=runs, var_name='run_label', value_name='response_time')
+    long_df = long_df.dropna(subset=['TransactionName'])
+
+    records = pd.DataFrame({
+        'TransactionName': long_df['TransactionName'].astype(str),
+        'run_date': run_date,
+        'run_label': long_df['run_label'],
+        'response_time': pd.to_numeric(long_df['response_time'], errors='coerce'),
+        'sla': pd.to_numeric(long_df['SLA'], errors='coerce') if 'SLA' in long_df.columns else None,
+        'report_name': report_name,
+    })
+    records = records.astype(object).where(records.notna(), None)
+    rows = records.itertuples(index=False, name=None)
+    # Run columns dropped since the last ingest of this date must not linger, so the whole date is replaced
+    with _lock, conn:
+        conn.execute("DELETE FROM runs WHERE run_date = ?", (run_date,))
+        conn.executemany("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return len(long_df)
+
+
+def stored_dates(conn):
+    return [row[0] for row in conn.execute("SELECT DISTINCT run_date FROM runs ORDER BY run_date")]
+
+
+def query_trend(conn, transactions=None, start=None, end=None, run_label=None):
+    # Per-day value for each transaction; averages run columns unless one is chosen.
+    # transactions=None means all transactions; an empty selection means none
+    if transactions is not None and len(transactions) == 0:
+        return pd.DataFrame(columns=TREND_COLUMNS).astype({'run_date': 'datetime64[ns]'})
+    clauses, params, joined = [], [], None
+    if transactions is not None and len(transactions) <= MAX_IN_PARAMS:
+        clauses.append(f"TransactionName IN ({', '.join('?' * len(transactions))})")
+        params.extend(transactions)
+    elif transactions is not None:
+        joined = f"trend_txns_{uuid.uuid4().hex}"
+    if start is not None:
+        clauses.append("run_date >= ?")
+        params.append(start.isoformat() if isinstance(start, date) else start)
+    if end is not None:
+        clauses.append("run_date <= ?")
+        params.append(end.isoformat() if isinstance(end, date) else end)
+    if run_label:
+        clauses.append("run_label = ?")
+        params.append(run_label)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    join = f"JOIN temp.{joined} USING (TransactionName)" if joined else ""
+
+    sql = f"""
+        SELECT TransactionName, run_date, AVG(response_time) AS response_time, MAX(sla) AS sla
+        FROM runs {join} {where}
+        GROUP BY TransactionName, run_date
+        ORDER BY TransactionName, run_date
+    """
+    if joined is None:
+        trend = pd.read_sql_query(sql, conn, params=params)
+    else:
+        with _lock:
+            conn.execute(f"CREATE TEMP TABLE {joined} (TransactionName TEXT PRIMARY KEY)")
+            try:
+                conn.executemany(f"INSERT OR IGNORE INTO temp.{joined} VALUES (?)",
+                                 ((str(name),) for name in transactions))
+                trend = pd.read_sql_query(sql, conn, params=params)
+            finally:
+                conn.execute(f"DROP TABLE temp.{joined}")
+                conn.commit()
+    trend['run_date'] = pd.to_datetime(trend['run_date'])
+    return trend
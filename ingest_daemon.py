@@ -0,0 +1,115 @@
+import argparse
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from report_cache import DEFAULT_CACHE_DIR, is_cached, report_digest, store_summary
+from report_pipeline import REPORT_SUFFIXES, analyze
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+log = logging.getLogger("ingest_daemon")
+
+
+def ingest_file(path, cache_dir):
+    digest = report_digest(path)
+    store_summary(analyze(path), digest, cache_dir)
+    return path, digest
+
+
+def scan(folder):
+    found = {}
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(REPORT_SUFFIXES) and not name.startswith('.'):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found[path] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+class IngestDaemon:
+    def __init__(self, folder, cache_dir=DEFAULT_CACHE_DIR, workers=None, interval=2.0):
+        self.folder = folder
+        self.cache_dir = cache_dir
+        self.interval = interval
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.wake = threading.Event()
+        self.pending = {}
+        self.previous = {}
+        # (path, signature) pairs that failed to parse; retried only once the file changes
+        self.failed = set()
+
+    def _start_watcher(self):
+        # inotify (via watchdog) only wakes the loop early; polling remains the source of truth
+        if Observer is None:
+            return None
+        wake = self.wake
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                wake.set()
+
+        observer = Observer()
+        observer.schedule(Handler(), self.folder, recursive=True)
+        observer.start()
+        return observer
+
+    def poll_once(self):
+        current = scan(self.folder)
+        for path, signature in current.items():
+            # A file is ingested once its size and mtime are unchanged across two scans (writer finished)
+            if self.previous.get(path) != signature or path in self.pending or (path, signature) in self.failed:
+                continue
+            digest = report_digest(path)
+            if is_cached(digest, self.cache_dir):
+                continue
+            log.info("ingesting %s", path)
+            self.pending[path] = (self.pool.submit(ingest_file, path, self.cache_dir), signature)
+        self.previous = current
+
+        for path, (future, signature) in list(self.pending.items()):
+            if future.done():
+                del self.pending[path]
+                try:
+                    future.result()
+                    log.info("cached %s", path)
+                except Exception:
+                    self.failed.add((path, signature))
+                    log.exception("failed to ingest %s", path)
+
+    def run(self):
+        observer = self._start_watcher()
+        try:
+            while True:
+                self.poll_once()
+                self.wake.wait(self.interval)
+                self.wake.clear()
+        finally:
+            if observer is not None:
+                observer.stop()
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a results folder and precompute dashboard summaries")
+    parser.add_argument("folder", help="directory that receives new report files")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--interval", type=float, default=2.0, help="polling interval in seconds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    IngestDaemon(args.folder, args.cache_dir, args.workers, args.interval).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+HAVE_NUMBA = numba is not None
+
+
+def group_offsets(codes, n_groups):
+    # codes must be sorted; offsets[g]:offsets[g + 1] is group g's slice
+    return np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=n_groups))]).astype(np.int64)
+
+
+def sort_by_group(codes, values):
+    # NaN latencies would sort to the end of their group and turn its top percentiles into NaN
+    measured = ~np.isnan(values)
+    if not measured.all():
+        codes, values = codes[measured], values[measured]
+    order = np.lexsort((values, codes))
+    return codes[order], values[order]
+
+
+# Pure-NumPy versions; values are sorted by (code, value) so percentiles are direct lookups
+
+def _grouped_percentile_numpy(sorted_values, offsets, q):
+    counts = np.diff(offsets)
+    position = offsets[:-1] + (counts - 1).clip(min=0) * q
+    last = max(len(sorted_values) - 1, 0)
+    low = np.floor(position).astype(np.int64).clip(0, last)
+    high = np.minimum(low + 1, offsets[1:] - 1).clip(0, last)
+    weight = position - low
+    if len(sorted_values) == 0:
+        return np.full(len(counts), np.nan)
+    result = sorted_values[low] * (1 - weight) + sorted_values[high] * weight
+    return np.where(counts > 0, result, np.nan)
+
+
+def _grouped_breach_count_numpy(values, offsets, thresholds):
+    codes = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    with np.errstate(invalid='ignore'):
+        breached = values > thresholds
+    return np.bincount(codes, weights=breached, minlength=len(offsets) - 1).astype(np.int64)
+
+
+def _grouped_histogram_numpy(values, offsets, edges):
+    n_groups, n_bins = len(offsets) - 1, len(edges) - 1
+    codes = np.repeat(np.arange(n_groups), np.diff(offsets))
+    bins = np.searchsorted(edges, values, side='right') - 1
+    bins[values == edges[-1]] = n_bins - 1
+    # NaN sorts past the last edge, so it falls out with the other out-of-range values
+    keep = (bins >= 0) & (bins < n_bins)
+    flat = np.bincount(codes[keep] * n_bins + bins[keep], minlength=n_groups * n_bins)
+    return flat.reshape(n_groups, n_bins)
+
+
+if HAVE_NUMBA:
+    @numba.njit(parallel=True, cache=True)
+    def _grouped_percentile_numba(sorted_values, offsets, q):
+        n_groups = len(offsets) - 1
+        out = np.empty(n_groups, dtype=np.float64)
+        for g in numba.prange(n_groups):
+            start, end = offsets[g], offsets[g + 1]
+            if end == start:
+                out[g] = np.nan
+                continue
+            position = start + (end - start - 1) * q
+            low = int(np.floor(position))
+            high = min(low + 1, end - 1)
+            weight = position - low
+            out[g] = sorted_values[low] * (1 - weight) + sorted_values[high] * weight
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _grouped_breach_count_numba(values, offsets, thresholds):
+        n_groups = len(offsets) - 1
+        out = np.zeros(n_groups, dtype=np.int64)
+        for g in numba.prange(n_groups):
+            count = 0
+            for i in range(offsets[g], offsets[g + 1]):
+                if values[i] > thresholds[i]:
+                    count += 1
+            out[g] = count
+        return out
+
+    @numba.njit(parallel=True, cache=True)
+    def _grouped_histogram_numba(values, offsets, edges):
+        n_groups, n_bins = len(offsets) - 1, len(edges) - 1
+        out = np.zeros((n_groups, n_bins), dtype=np.int64)
+        for g in numba.prange(n_groups):
+            for i in range(offsets[g], offsets[g + 1]):
+                value = values[i]
+                if np.isnan(value) or value < edges[0] or value > edges[-1]:
+                    continue
+                b = np.searchsorted(edges, value, side='right') - 1
+                if b >= n_bins:
+                    b = n_bins - 1
+                out[g, b] += 1
+        return out
+
+
+def grouped_percentile(sorted_values, offsets, q, use_numba=True):
+    if HAVE_NUMBA and use_numba:
+        return _grouped_percentile_numba(sorted_values, offsets, float(q))
+    return _grouped_percentile_numpy(sorted_values, offsets, q)
+
+
+def grouped_breach_count(values, offsets, thresholds, use_numba=True):
+    # thresholds is a scalar, one limit per group, or one per value (e.g. each transaction's SLA);
+    # NaN values or limits never count as breaches
+    values = np.asarray(values)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    if thresholds.ndim == 0:
+        thresholds = np.full(len(values), float(thresholds))
+    elif len(thresholds) != len(values):
+        thresholds = np.repeat(thresholds, np.diff(offsets))
+    if HAVE_NUMBA and use_numba:
+        return _grouped_breach_count_numba(values, offsets, thresholds)
+    return _grouped_breach_count_numpy(values, offsets, thresholds)
+
+
+def grouped_histogram(values, offsets, edges, use_numba=True):
+    values = np.asarray(values)
+    edges = np.asarray(edges, dtype=np.float64)
+    if HAVE_NUMBA and use_numba:
+        return _grouped_histogram_numba(values, offsets, edges)
+    return _grouped_histogram_numpy(values, offsets, edges)
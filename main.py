@@ -1,53 +1,176 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import plotly.express as px
 
+from approx_mode import DEFAULT_SAMPLE_BUDGET, ApproxSample, histogram_estimate, mean_estimate, percentile_estimate, submit_exact
+from cache_registry import registered_cache
+from histogram_service import bin_edges, histogram_counts, histogram_figure, smallest_positive
+from metrics import LOAD_SECONDS, serve
+from report_loader import file_key
+from sample_store import SampleStore, samples_from_frame, store_path, write_store
+
 # Configure the page
 st.set_page_config(page_title="Performance Load Test Dashboard", layout="wide")
 
 # Title of the app
 st.title("Performance Load Test Report Analysis")
 
+# Metrics endpoint for a local scraper, started once per server process
+@st.cache_resource
+def start_metrics_server():
+    return serve()
+
+start_metrics_server()
+
 # Sidebar instructions and file upload
 st.sidebar.header("Upload Test Reports")
 file_run1 = st.sidebar.file_uploader("Upload Test Report for Run 1", type=["csv", "xlsx"])
 file_run2 = st.sidebar.file_uploader("Upload Test Report for Run 2 (Optional)", type=["csv", "xlsx"])
 
+# Rows parsed for the preview once an upload's samples are in the sample store
+PREVIEW_ROWS = 1000
+
 # Function to load data into a DataFrame
-@st.cache_data
+@registered_cache("load_data")
+def parse_data(file, nrows=None):
+    if file.name.endswith('csv'):
+        df = pd.read_csv(file, nrows=nrows)
+    else:
+        df = pd.read_excel(file, nrows=nrows)
+    return df
+
+@registered_cache("sample stores", kind="resource", max_entries=8)
+def open_sample_store(path):
+    return SampleStore(path)
+
+# Raw timings are parsed once into a memory-mapped sample store keyed by content digest. Once the store
+# exists only a preview is parsed, and the slider, histogram, mean and approximate paths read the store.
+# Returns (frame, store); store is None for uploads without TransactionName and response_time
 def load_data(file):
-    if file is not None:
-        if file.name.endswith('csv'):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-        return df
-    return None
+    if file is None:
+        return None, None
+    with LOAD_SECONDS.time(stage="load_data"):
+        path = store_path(file_key(file))
+        if SampleStore.exists(path):
+            return parse_data(file, nrows=PREVIEW_ROWS), open_sample_store(path)
+        df = parse_data(file)
+        if 'response_time' in df.columns and 'TransactionName' in df.columns:
+            write_store(path, samples_from_frame(df, 'response_time', name_col='TransactionName', time_col='Timestamp'))
+            return df, open_sample_store(path)
+        return df, None
 
 # Load datasets
-df1 = load_data(file_run1)
-df2 = load_data(file_run2)
+df1, store1 = load_data(file_run1)
+df2, store2 = load_data(file_run2)
+
+# Histogram binning options (bins are computed server-side)
+st.sidebar.subheader("Histogram Options")
+hist_bins = st.sidebar.number_input("Number of bins", min_value=5, max_value=500, value=50, step=5)
+hist_log = st.sidebar.checkbox("Log-scale bins", value=False)
+
+def response_values(df, store=None):
+    # The store's latencies are a read-only memory map, so nothing is re-parsed or copied.
+    # NaNs fall outside the explicit bin edges, so no dropna copy is needed
+    if store is not None:
+        return store.latency
+    return df['response_time'].to_numpy(dtype=float)
+
+def range_mean(values, value_range):
+    with np.errstate(invalid='ignore'):
+        selected = values[(values >= value_range[0]) & (values <= value_range[1])]
+    return float(selected.mean(dtype=np.float64)) if len(selected) else float('nan')
+
+# Approximate mode: answer from a stratified sample so slider moves never touch the full data
+st.sidebar.subheader("Approximate Mode")
+approx_mode = st.sidebar.checkbox("Answer from a sample", value=False,
+                                  help="Stratified per-transaction reservoir sample; estimates show 95% confidence intervals.")
+sample_budget = st.sidebar.number_input("Sample size", min_value=1_000, max_value=1_000_000, value=DEFAULT_SAMPLE_BUDGET, step=1_000) if approx_mode else DEFAULT_SAMPLE_BUDGET
+
+@registered_cache("approx samples", kind="resource", max_entries=4)
+def get_approx_sample(data_key, budget, _df, _store=None):
+    if _store is not None:
+        return ApproxSample(_store.latency, _store.codes, budget)
+    strata = _df['TransactionName'] if 'TransactionName' in _df.columns else None
+    return ApproxSample(_df['response_time'], strata, budget)
+
+# Polls only while the exact computation is pending: when it finishes, a full rerun renders the result
+# and this fragment is no longer drawn, so its timer stops
+@st.fragment(run_every=1)
+def wait_for_exact(label):
+    request, future = st.session_state[f'exact_{label}']
+    if future.done():
+        st.rerun()
+    st.info(f"Computing exact statistics for {label} {request[0]:.2f} - {request[1]:.2f}...")
+
+def exact_result(label):
+    request, future = st.session_state[f'exact_{label}']
+    if not future.done():
+        wait_for_exact(label)
+        return
+    result = future.result()
+    st.success(f"Exact {label} ({request[0]:.2f} - {request[1]:.2f}): mean {result['mean']:.2f}, "
+               f"p90 {result['p90']:.2f}, p95 {result['p95']:.2f}")
+
+def approximate_section(label, df, store, file, response_filter):
+    sample = get_approx_sample(file_key(file), sample_budget, df, store)
+    values, weights = sample.within(response_filter)
+    mean, mean_low, mean_high = mean_estimate(values, weights, sample.population)
+    p90, p90_low, p90_high = percentile_estimate(values, weights, 0.90)
+    p95, p95_low, p95_high = percentile_estimate(values, weights, 0.95)
+
+    cols = st.columns(3)
+    cols[0].metric("Mean (approx.)", f"{mean:.2f}", help=f"95% CI {mean_low:.2f} - {mean_high:.2f}")
+    cols[1].metric("p90 (approx.)", f"{p90:.2f}", help=f"95% CI {p90_low:.2f} - {p90_high:.2f}")
+    cols[2].metric("p95 (approx.)", f"{p95:.2f}", help=f"95% CI {p95_low:.2f} - {p95_high:.2f}")
+    st.caption(f"Estimated from {len(values):,} sampled rows of {sample.population:,}; hover a value for its 95% confidence interval.")
+
+    positive_low = smallest_positive(values, response_filter[1]) if hist_log and response_filter[0] <= 0 else None
+    edges = bin_edges(response_filter[0], response_filter[1], hist_bins, hist_log, positive_low)
+    counts, error = histogram_estimate(values, weights, edges)
+    fig = histogram_figure([(label, edges, counts, error)], f"{label} Response Times (approximate)", log=hist_log)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # The exact answer runs on a worker thread and shows up when it is ready
+    if st.button(f"Compute exact statistics for {label}"):
+        st.session_state[f'exact_{label}'] = (response_filter, submit_exact(response_values(df, store), response_filter, edges))
+    if f'exact_{label}' in st.session_state:
+        exact_result(label)
+    return mean
 
 # Display uploaded data and some basic filtering options
 if df1 is not None:
     st.header("Run 1 Data Preview")
     st.write(df1.head())
 
+    # Per-transaction percentiles straight from the memory-mapped samples (grouped kernels)
+    if store1 is not None:
+        st.subheader("Per-Transaction Percentiles - Run 1")
+        percentile_table = store1.percentiles()
+        sla_ms = st.number_input("SLA threshold (ms) for the per-transaction table", min_value=0.0, value=1000.0, step=100.0)
+        percentile_table['Above SLA'] = store1.breach_counts(sla_ms)
+        st.dataframe(percentile_table, use_container_width=True)
+
     # Sample filters: Adjust these filters based on your report structure
     st.sidebar.subheader("Filters for Run 1")
 
     # Example: Filter by a response time column (replace 'response_time' with actual column name)
     if 'response_time' in df1.columns:
-        min_val = float(df1['response_time'].min())
-        max_val = float(df1['response_time'].max())
+        values1 = response_values(df1, store1)
+        min_val = float(np.nanmin(values1))
+        max_val = float(np.nanmax(values1))
         response_filter = st.sidebar.slider("Response Time Range (Run 1)", min_val, max_val, (min_val, max_val))
-        df1 = df1[(df1['response_time'] >= response_filter[0]) & (df1['response_time'] <= response_filter[1])]
 
     # Create a histogram for response times using Plotly
-    if 'response_time' in df1.columns:
+    if 'response_time' in df1.columns and approx_mode:
+        st.subheader("Response Time Distribution - Run 1")
+        avg_run1 = approximate_section("Run 1", df1, store1, file_run1, response_filter)
+    elif 'response_time' in df1.columns:
+        avg_run1 = range_mean(values1, response_filter)
         st.subheader("Response Time Distribution - Run 1")
-        fig = px.histogram(df1, x="response_time", nbins=50, title="Run 1 Response Times")
+        edges, counts = histogram_counts(values1, file_key(file_run1), response_filter, hist_bins, hist_log)
+        fig = histogram_figure([("Run 1", edges, counts)], "Run 1 Response Times", log=hist_log)
         st.plotly_chart(fig, use_container_width=True)
     
 if df2 is not None:
@@ -56,14 +179,19 @@ if df2 is not None:
 
     st.sidebar.subheader("Filters for Run 2")
     if 'response_time' in df2.columns:
-        min_val = float(df2['response_time'].min())
-        max_val = float(df2['response_time'].max())
+        values2 = response_values(df2, store2)
+        min_val = float(np.nanmin(values2))
+        max_val = float(np.nanmax(values2))
         response_filter2 = st.sidebar.slider("Response Time Range (Run 2)", min_val, max_val, (min_val, max_val))
-        df2 = df2[(df2['response_time'] >= response_filter2[0]) & (df2['response_time'] <= response_filter2[1])]
 
-    if 'response_time' in df2.columns:
+    if 'response_time' in df2.columns and approx_mode:
         st.subheader("Response Time Distribution - Run 2")
-        fig2 = px.histogram(df2, x="response_time", nbins=50, title="Run 2 Response Times")
+        avg_run2 = approximate_section("Run 2", df2, store2, file_run2, response_filter2)
+    elif 'response_time' in df2.columns:
+        avg_run2 = range_mean(values2, response_filter2)
+        st.subheader("Response Time Distribution - Run 2")
+        edges2, counts2 = histogram_counts(values2, file_key(file_run2), response_filter2, hist_bins, hist_log)
+        fig2 = histogram_figure([("Run 2", edges2, counts2)], "Run 2 Response Times", log=hist_log)
         st.plotly_chart(fig2, use_container_width=True)
 
 # Comparison section if two files are uploaded
@@ -72,8 +200,6 @@ if (df1 is not None) and (df2 is not None):
     
     # Compute average response times (modify as per your actual data columns)
     if 'response_time' in df1.columns and 'response_time' in df2.columns:
-        avg_run1 = df1['response_time'].mean()
-        avg_run2 = df2['response_time'].mean()
         comparison_df = pd.DataFrame({
             "Test Run": ["Run 1", "Run 2"],
             "Average Response Time": [avg_run1, avg_run2]
@@ -85,6 +211,15 @@ if (df1 is not None) and (df2 is not None):
                           title="Average Response Time Comparison",
                           text_auto='.2f')
         st.plotly_chart(comp_fig, use_container_width=True)
+
+        # Overlay both distributions on shared bin edges (exact mode only; it bins the full data)
+        if not approx_mode:
+            overlay_range = (min(response_filter[0], response_filter2[0]), max(response_filter[1], response_filter2[1]))
+            overlay = [
+                ("Run 1",) + histogram_counts(values1, file_key(file_run1), overlay_range, hist_bins, hist_log),
+                ("Run 2",) + histogram_counts(values2, file_key(file_run2), overlay_range, hist_bins, hist_log),
+            ]
+            st.plotly_chart(histogram_figure(overlay, "Response Time Distribution: Run 1 vs Run 2", log=hist_log), use_container_width=True)
     
     # You can add more comparisons such as percentile analysis, error rates, etc.
     st.markdown("**Note:** You can further customize filters and charts based on the metrics available in your reports.")
@@ -0,0 +1,179 @@
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from metrics import REGISTRY
+from report_cache import DEFAULT_CACHE_DIR
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+HAVE_ARROW = pa is not None
+# Smallest budget the dashboard accepts; a lower environment value is raised to it
+MIN_BUDGET_MB = 64
+DEFAULT_BUDGET_BYTES = int(max(float(os.environ.get("DASHBOARD_SESSION_BUDGET_MB", 1024)), MIN_BUDGET_MB) * 1024 ** 2)
+SPILL_EVENTS = REGISTRY.counter("dashboard_session_spill_total", "Session frames spilled, rehydrated or evicted")
+
+
+def frame_bytes(frame):
+    # Shallow size: object columns count their pointers only, which keeps this cheap on every rerun.
+    # Frame views only own their position arrays and derived columns
+    if not hasattr(frame, 'memory_usage'):
+        return frame.nbytes
+    return int(np.sum(frame.memory_usage(index=True, deep=False)))
+
+
+def _write_spill(frame, path):
+    if HAVE_ARROW:
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=True)
+            with pa.OSFile(path + ".arrow", 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            return path + ".arrow"
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+    with open(path + ".pkl", 'wb') as out:
+        pickle.dump(frame, out, protocol=pickle.HIGHEST_PROTOCOL)
+    return path + ".pkl"
+
+
+def _read_spill(path):
+    if path.endswith(".arrow"):
+        # The IPC file is memory-mapped, so only the pages pandas touches are read back
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+    with open(path, 'rb') as source:
+        return pickle.load(source)
+
+
+class _Held:
+    __slots__ = ('frame', 'path', 'nbytes', 'accessed', 'spillable', 'evictable')
+
+    def __init__(self, frame, spillable, evictable):
+        self.frame = frame
+        self.path = None
+        self.nbytes = frame_bytes(frame)
+        self.accessed = time.monotonic()
+        self.spillable = spillable
+        self.evictable = evictable
+
+
+class MemoryGovernor:
+    # Held frames survive reruns and are spilled (memory-mapped Arrow IPC, or pickle without pyarrow) or evicted
+    # when the session goes over budget; get() rehydrates them. Noted frames are weak references to what the
+    # current rerun built and only count towards the budget while the script keeps them alive
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES, spill_root=os.path.join(DEFAULT_CACHE_DIR, "spill")):
+        self.budget_bytes = budget_bytes
+        self.spill_dir = os.path.join(spill_root, uuid.uuid4().hex)
+        self.spills = 0
+        self.evictions = 0
+        self._held = {}
+        self._noted = {}
+        self._lock = threading.RLock()
+        # Spill files go with the session: its state is garbage collected when the browser tab closes
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+
+    def hold(self, name, frame, spillable=True, evictable=False):
+        with self._lock:
+            self._discard(name)
+            self._held[name] = _Held(frame, spillable, evictable)
+            self.enforce(keep=name)
+        return frame
+
+    def note(self, name, frame):
+        with self._lock:
+            self._noted[name] = (weakref.ref(frame), frame_bytes(frame))
+            self.enforce()
+        return frame
+
+    def get(self, name, default=None):
+        with self._lock:
+            held = self._held.get(name)
+            if held is None:
+                return default
+            held.accessed = time.monotonic()
+            if held.frame is None:
+                held.frame = _read_spill(held.path)
+                os.remove(held.path)
+                held.path = None
+                SPILL_EVENTS.inc(action="rehydrate")
+                self.enforce(keep=name)
+            return held.frame
+
+    def drop(self, name):
+        with self._lock:
+            self._discard(name)
+
+    def _discard(self, name):
+        held = self._held.pop(name, None)
+        if held is not None and held.path is not None and os.path.exists(held.path):
+            os.remove(held.path)
+
+    def resident_bytes(self):
+        with self._lock:
+            held = sum(entry.nbytes for entry in self._held.values() if entry.frame is not None)
+            # A frame noted under several names (e.g. an unfiltered view of df) is counted once
+            seen = {id(entry.frame) for entry in self._held.values() if entry.frame is not None}
+            noted = 0
+            for name, (ref, nbytes) in list(self._noted.items()):
+                frame = ref()
+                if frame is None:
+                    del self._noted[name]
+                elif id(frame) not in seen:
+                    seen.add(id(frame))
+                    noted += nbytes
+            return held + noted
+
+    def spilled_bytes(self):
+        return sum(entry.nbytes for entry in self._held.values() if entry.frame is None)
+
+    def over_budget(self):
+        return self.resident_bytes() > self.budget_bytes
+
+    def enforce(self, keep=None):
+        # Coldest held frames go first; noted frames belong to the running script and are never touched
+        with self._lock:
+            excess = self.resident_bytes() - self.budget_bytes
+            if excess <= 0:
+                return
+            candidates = sorted((entry.accessed, name) for name, entry in self._held.items()
+                                if entry.frame is not None and name != keep)
+            for _, name in candidates:
+                if excess <= 0:
+                    break
+                entry = self._held[name]
+                if entry.spillable:
+                    os.makedirs(self.spill_dir, exist_ok=True)
+                    entry.path = _write_spill(entry.frame, os.path.join(self.spill_dir, name))
+                    entry.frame = None
+                    self.spills += 1
+                    SPILL_EVENTS.inc(action="spill")
+                elif entry.evictable:
+                    del self._held[name]
+                    self.evictions += 1
+                    SPILL_EVENTS.inc(action="evict")
+                else:
+                    continue
+                excess -= entry.nbytes
+
+    def entries(self):
+        with self._lock:
+            rows = [{'frame': name, 'state': 'resident' if entry.frame is not None else 'spilled',
+                     'bytes': entry.nbytes} for name, entry in self._held.items()]
+            rows += [{'frame': name, 'state': 'rerun', 'bytes': nbytes}
+                     for name, (ref, nbytes) in self._noted.items() if ref() is not None]
+            return pd.DataFrame(rows, columns=['frame', 'state', 'bytes'])
+
+    def close(self):
+        self._held.clear()
+        self._noted.clear()
+        self._finalizer()
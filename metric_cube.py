@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from report_schema import parse_run_column, report_metrics
+
+
+class MetricCube:
+    # Dense float32 values indexed [transaction, run, metric]. Storage is metric-major so a
+    # metric slice is a view and switching metric never copies. _storage may be larger than
+    # _data: appended cubes keep spare capacity so a series of appends does not copy on every run.
+    def __init__(self, data, transactions, runs, metrics, storage=None, present=None):
+        self._data = data
+        self._storage = data if storage is None else storage
+        # present[metric, run]: whether the report had that column; absent columns are all-NaN, not measurements
+        self.present = np.ones((len(metrics), len(runs)), dtype=bool) if present is None else present
+        self.values = data.transpose(1, 2, 0)
+        self.transactions = transactions
+        self.runs = runs
+        self.metrics = metrics
+        self.transaction_index = {name: i for i, name in enumerate(transactions)}
+        self.run_index = {run: i for i, run in enumerate(runs)}
+        self.metric_index = {metric: i for i, metric in enumerate(metrics)}
+
+    def __setstate__(self, state):
+        # Summaries pickled by older versions have no presence mask; treat their columns as present
+        self.__dict__.update(state)
+        if 'present' not in state:
+            self.present = np.ones((len(self.metrics), len(self.runs)), dtype=bool)
+
+    @classmethod
+    def from_frame(cls, df):
+        parsed = {col: parse_run_column(col) for col in df.columns}
+        parsed = {col: value for col, value in parsed.items() if value is not None}
+        run_numbers = sorted({number for number, _ in parsed.values()})
+        metrics = report_metrics(parsed)
+        runs = [f'Run{number}' for number in run_numbers]
+
+        data = np.full((len(metrics), len(df), len(runs)), np.nan, dtype=np.float32)
+        present = np.zeros((len(metrics), len(runs)), dtype=bool)
+        run_pos = {number: i for i, number in enumerate(run_numbers)}
+        metric_pos = {metric: i for i, metric in enumerate(metrics)}
+        for col, (number, metric) in parsed.items():
+            data[metric_pos[metric], :, run_pos[number]] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float32)
+            present[metric_pos[metric], run_pos[number]] = True
+        transactions = df['TransactionName'].to_numpy() if 'TransactionName' in df.columns else np.arange(len(df))
+        return cls(data, transactions, runs, metrics, present=present)
+
+    def metric(self, metric):
+        return self._data[self.metric_index[metric]]
+
+    def column(self, run, metric):
+        return self._data[self.metric_index[metric], :, self.run_index[run]]
+
+    def runs_with(self, metric):
+        return self.present[self.metric_index[metric]]
+
+    def columns_for(self, metric):
+        return [f'{run}-{metric}' for run in self.runs]
+
+    def run_means(self, metric, rows=None):
+        view = self.metric(metric)
+        if rows is not None:
+            view = view[rows]
+        # Storage stays float32; the sums are accumulated in float64 so large reports do not drift
+        with np.errstate(all='ignore'):
+            means = np.nanmean(view, axis=0, dtype=np.float64) if len(view) else np.full(len(self.runs), np.nan)
+        return dict(zip(self.columns_for(metric), means.astype(float)))
+
+    def append_run(self, run, metric, values, new_transactions=()):
+        # Writes into spare capacity and returns a cube over the shared storage; when an axis is full the
+        # storage doubles along it, so n appends copy the cube O(log n) times. The previous cube stays valid
+        # (its region is never written), but only the newest cube of a chain may be appended to.
+        metrics = self.metrics + ([metric] if metric not in self.metric_index else [])
+        runs = self.runs + ([run] if run not in self.run_index else [])
+        size = len(self.transactions) + len(new_transactions)
+        needed = (len(metrics), size, len(runs))
+        storage = self._storage
+        if any(need > cap for need, cap in zip(needed, storage.shape)):
+            shape = tuple(max(need, 2 * cap) if need > cap else cap for need, cap in zip(needed, storage.shape))
+            storage = np.full(shape, np.nan, dtype=np.float32)
+            storage[:len(self.metrics), :len(self.transactions), :len(self.runs)] = self._data
+        data = storage[:needed[0], :needed[1], :needed[2]]
+        data[metrics.index(metric), :, runs.index(run)] = values
+        present = np.zeros((len(metrics), len(runs)), dtype=bool)
+        present[:len(self.metrics), :len(self.runs)] = self.present
+        present[metrics.index(metric), runs.index(run)] = True
+        transactions = np.concatenate([self.transactions, np.asarray(list(new_transactions), dtype=self.transactions.dtype)])
+        return MetricCube(data, transactions, runs, metrics, storage, present)
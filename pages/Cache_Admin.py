@@ -0,0 +1,53 @@
+import pandas as pd
+import streamlit as st
+
+import figure_cache  # noqa: F401  (registers the figure cache)
+import histogram_service  # noqa: F401
+import ranking  # noqa: F401
+import report_loader  # noqa: F401
+from cache_registry import CACHES
+
+st.set_page_config(page_title="Cache Admin", layout="wide")
+st.title("Cache Admin")
+st.caption("Caches are shared by every session on this server. Caches registered by a dashboard script "
+           "appear after that script has run once.")
+
+stats = pd.DataFrame(CACHES.stats())
+if stats.empty:
+    st.info("No caches registered yet.")
+    st.stop()
+
+st.metric("Total cached bytes", f"{stats['bytes'].sum() / 1024 ** 2:.1f} MB")
+st.dataframe(stats, use_container_width=True, hide_index=True)
+if st.button("Purge all caches"):
+    CACHES.purge_all()
+    st.rerun()
+
+name = st.selectbox("Cache", stats['cache'])
+layer = CACHES.get(name)
+
+st.subheader("Policy")
+if layer.kind != "managed":
+    st.caption("Streamlit caches can only be cleared as a whole, so a TTL or size breach drops every entry.")
+with st.form(f"policy_{name}"):
+    ttl = st.number_input("TTL (seconds, 0 = none)", min_value=0, value=int(layer.ttl or 0), step=60)
+    max_mb = st.number_input("Max size (MB, 0 = none)", min_value=0.0,
+                             value=(layer.max_bytes or 0) / 1024 ** 2, step=16.0)
+    if st.form_submit_button("Apply"):
+        layer.set_policy(ttl=ttl, max_bytes=int(max_mb * 1024 ** 2))
+        st.rerun()
+
+st.subheader("Entries")
+entries = pd.DataFrame(layer.entries())
+if entries.empty:
+    st.caption("No entries.")
+else:
+    st.dataframe(entries.sort_values('bytes', ascending=False), use_container_width=True, hide_index=True)
+    if layer.kind == "managed":
+        key = st.selectbox("Entry", entries['key'])
+        if st.button("Purge entry"):
+            layer.purge(key)
+            st.rerun()
+if st.button(f"Purge {name}"):
+    layer.purge()
+    st.rerun()
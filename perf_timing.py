@@ -0,0 +1,61 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from metrics import SECTION_SECONDS
+
+# Keep the most recent section executions per session for before/after comparisons
+HISTORY_LENGTH = 200
+
+
+def _log():
+    if 'rerun_log' not in st.session_state:
+        st.session_state['rerun_log'] = deque(maxlen=HISTORY_LENGTH)
+    return st.session_state['rerun_log']
+
+
+def measuring():
+    return st.session_state.get('measure_reruns', False)
+
+
+@contextmanager
+def section_timer(name):
+    start = time.perf_counter()
+    entry = {'section': name, 'payload_bytes': 0}
+    try:
+        yield entry
+    finally:
+        entry['ms'] = (time.perf_counter() - start) * 1000
+        SECTION_SECONDS.observe(entry['ms'] / 1000, section=name)
+        entry['at'] = time.strftime('%H:%M:%S')
+        _log().append(entry)
+
+
+def plotly_chart(fig, entry=None, **kwargs):
+    # Serialising the figure only to count bytes costs time, so it happens only while measuring
+    if entry is not None and measuring():
+        entry['payload_bytes'] += len(fig.to_json())
+    st.plotly_chart(fig, **kwargs)
+
+
+def dataframe(data, entry=None, **kwargs):
+    if entry is not None and measuring():
+        entry['payload_bytes'] += int(data.memory_usage(deep=True).sum())
+    st.dataframe(data, **kwargs)
+
+
+def show_rerun_log():
+    with st.sidebar.expander("Rerun timings"):
+        st.checkbox("Measure payload bytes", key='measure_reruns')
+        log = _log()
+        if log:
+            log_df = pd.DataFrame(list(log))[['at', 'section', 'ms', 'payload_bytes']]
+            st.dataframe(log_df.iloc[::-1], use_container_width=True)
+            st.dataframe(log_df.groupby('section')[['ms', 'payload_bytes']].mean().round(1))
+            if st.button("Clear timings"):
+                log.clear()
+        else:
+            st.caption("No section runs recorded yet.")
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from cache_registry import registered_cache
+from figure_cache import frame_fingerprint
+
+DEFAULT_TOP_K = 10
+
+
+def top_k_indices(scores, k, largest=True):
+    # argpartition finds the K candidates in O(n); only those K are sorted
+    scores = np.asarray(scores, dtype=float)
+    keyed = np.where(np.isnan(scores), np.inf, -scores if largest else scores)
+    k = min(k, len(keyed))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    idx = np.argpartition(keyed, k - 1)[:k]
+    idx = idx[np.argsort(keyed[idx], kind='stable')]
+    return idx[np.isfinite(keyed[idx])]
+
+
+def slowest_per_run(names, matrix, run_cols, k):
+    frames = []
+    for j, run in enumerate(run_cols):
+        idx = top_k_indices(matrix[:, j], k)
+        frames.append(pd.DataFrame({'Run': run, 'Rank': np.arange(1, len(idx) + 1),
+                                    'TransactionName': names[idx], 'Response Time': matrix[idx, j]}))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def breach_scores(matrix, sla):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = matrix / sla[:, None]
+    breaches = (matrix > sla[:, None]).sum(axis=1)
+    worst = np.max(np.where(np.isnan(ratio), -np.inf, ratio), axis=1, initial=-np.inf)
+    # Rank by number of breaching runs, then by how far the worst run is over SLA
+    over = np.clip(worst, 0, None)
+    score = np.where(breaches > 0, breaches + over / (1 + over), np.nan)
+    return score, breaches, worst
+
+
+def most_breaching(names, matrix, sla, run_cols, k):
+    score, breaches, worst = breach_scores(matrix, sla)
+    idx = top_k_indices(score, k)
+    return pd.DataFrame({'TransactionName': names[idx], 'SLA': sla[idx], 'Breaching Runs': breaches[idx],
+                         'Worst / SLA': worst[idx].round(2)})
+
+
+def most_regressed(names, matrix, run_cols, k):
+    if len(run_cols) < 2:
+        return pd.DataFrame(columns=['TransactionName', 'From', 'To', 'Change', 'Change %'])
+    first, last = matrix[:, 0], matrix[:, -1]
+    change = last - first
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(first > 0, change / first * 100, np.nan)
+    idx = top_k_indices(change_pct, k)
+    idx = idx[change[idx] > 0]
+    return pd.DataFrame({'TransactionName': names[idx], 'From': first[idx], 'To': last[idx],
+                         'Change': change[idx], 'Change %': change_pct[idx].round(1)})
+
+
+def most_breaching_rows(df, run_cols, k=DEFAULT_TOP_K):
+    score, _, _ = breach_scores(df[list(run_cols)].to_numpy(dtype=float), df['SLA'].to_numpy(dtype=float))
+    return df.iloc[top_k_indices(score, k)]
+
+
+def rank_transactions(df, run_cols, k=DEFAULT_TOP_K):
+    names = df['TransactionName'].to_numpy()
+    matrix = df[list(run_cols)].to_numpy(dtype=float)
+    rankings = {
+        'slowest': slowest_per_run(names, matrix, run_cols, k),
+        'regressed': most_regressed(names, matrix, run_cols, k),
+    }
+    if 'SLA' in df.columns:
+        rankings['breaching'] = most_breaching(names, matrix, df['SLA'].to_numpy(dtype=float), run_cols, k)
+    return rankings
+
+
+@registered_cache("rankings", max_entries=32, show_spinner=False)
+def _cached_rankings(_df, fingerprint, run_cols, k):
+    return rank_transactions(_df, list(run_cols), k)
+
+
+def cached_rankings(df, run_cols, k=DEFAULT_TOP_K):
+    return _cached_rankings(df, frame_fingerprint(df), tuple(run_cols), k)
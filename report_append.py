@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from metric_cube import MetricCube
+from report_loader import value_column
+from report_schema import DEFAULT_METRIC, parse_run_column, run_columns
+from sla_rules import CRITICAL, OK
+
+
+class ReportState:
+    # A loaded report plus running aggregates that are updated one run at a time: means, the default
+    # SLA check's status and breach count, and the long-format trend points of every run column
+    def __init__(self, df):
+        self.frame = df.reset_index(drop=True)
+        self.cube = MetricCube.from_frame(self.frame)
+        self.sums, self.counts = {}, {}
+        self.status, self.breaches, self.trend = {}, {}, {}
+        for col in self.frame.columns:
+            if parse_run_column(col) is not None:
+                self._aggregate(col)
+        self.appended = []
+
+    def _aggregate(self, col):
+        values = pd.to_numeric(self.frame[col], errors='coerce').to_numpy(dtype=float)
+        measured = ~np.isnan(values)
+        self.sums[col] = float(values[measured].sum())
+        self.counts[col] = int(measured.sum())
+        if 'SLA' in self.frame.columns:
+            # Same result as the default rule: over the SLA, or missing a value or an SLA, is critical
+            sla = pd.to_numeric(self.frame['SLA'], errors='coerce').to_numpy(dtype=float)
+            with np.errstate(invalid='ignore'):
+                breached = ~(values <= sla)
+            self.status[col] = np.where(breached, CRITICAL, OK).astype(np.int8)
+            self.breaches[col] = int(breached.sum())
+        if 'TransactionName' in self.frame.columns:
+            self.trend[col] = pd.DataFrame({'TransactionName': self.frame['TransactionName'].to_numpy(), 'Run': col,
+                                            'Response Time': values})
+
+    @staticmethod
+    def _metric_column(run_df, metric):
+        # The appended values must be the selected metric, not whichever response time column comes first
+        runs = run_columns(run_df.columns, metric)
+        if runs:
+            return runs[0]
+        named = [col for col in run_df.columns if str(col) == metric or str(col).endswith(f'-{metric}')]
+        if named:
+            return named[0]
+        if metric == DEFAULT_METRIC:
+            return value_column(run_df)
+        raise ValueError(f"Run file has no {metric} column.")
+
+    def next_run_number(self):
+        numbers = [parse_run_column(col)[0] for col in self.frame.columns if parse_run_column(col) is not None]
+        return max(numbers, default=0) + 1
+
+    def append_run(self, run_df, metric=DEFAULT_METRIC):
+        if 'TransactionName' not in run_df.columns:
+            raise ValueError("Run file has no TransactionName column.")
+        source = self._metric_column(run_df, metric)
+        number = self.next_run_number()
+        col = f'Run{number}-{metric}'
+        series = run_df.drop_duplicates('TransactionName', keep='last').set_index('TransactionName')[source]
+        series = pd.to_numeric(series, errors='coerce')
+
+        # Transactions first seen in this run become new rows with no values for earlier runs
+        new_names = series.index[~series.index.isin(self.frame['TransactionName'])]
+        if len(new_names):
+            new_rows = pd.DataFrame({'TransactionName': new_names})
+            if 'SLA' in run_df.columns and 'SLA' in self.frame.columns:
+                new_rows['SLA'] = new_rows['TransactionName'].map(run_df.drop_duplicates('TransactionName', keep='last').set_index('TransactionName')['SLA'])
+            # Earlier runs have no values for new rows, so their sums, counts and trend points stay valid;
+            # their status only grows by the new rows, which are missing (critical) for every earlier run
+            self.frame = pd.concat([self.frame, new_rows], ignore_index=True)
+            for old_col, status in self.status.items():
+                self.status[old_col] = np.concatenate([status, np.full(len(new_names), CRITICAL, dtype=np.int8)])
+                self.breaches[old_col] += len(new_names)
+
+        self.frame[col] = self.frame['TransactionName'].map(series)
+        self.cube = self.cube.append_run(f'Run{number}', metric, self.frame[col].to_numpy(dtype=np.float32), new_names)
+        self._aggregate(col)
+        self.appended.append(col)
+        return col
+
+    def run_means(self, metric=DEFAULT_METRIC):
+        return {col: (self.sums[col] / self.counts[col] if self.counts[col] else np.nan)
+                for col in self.sums if parse_run_column(col)[1] == metric}
+
+    def sla_severity(self, cube, metric=DEFAULT_METRIC, rows=None):
+        # [transaction, run] severity of the default SLA rule, assembled from the per-run status kept by append_run
+        size = len(self.frame) if rows is None else len(rows)
+        severity = np.zeros((size, len(cube.runs)), dtype=np.int8)
+        for col, status in self.status.items():
+            number, col_metric = parse_run_column(col)
+            if col_metric == metric and f'Run{number}' in cube.run_index:
+                severity[:, cube.run_index[f'Run{number}']] = status if rows is None else status[rows]
+        return severity
+
+    def sla_breaches(self, metric=DEFAULT_METRIC):
+        return {col: count for col, count in self.breaches.items() if parse_run_column(col)[1] == metric}
+
+    def trend_frame(self, cols, rows=None):
+        # Long-format trend points for cols; an earlier run's points stop before rows appended after it
+        parts = []
+        for col in cols:
+            points = self.trend.get(col)
+            if points is not None and rows is not None:
+                points = points.iloc[rows[rows < len(points)]]
+            if points is not None:
+                parts.append(points)
+        return pd.concat(parts, ignore_index=True) if parts else None
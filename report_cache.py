@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import pickle
+import time
+
+DEFAULT_CACHE_DIR = ".perf_cache"
+
+
+def report_digest(path):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _reports_dir(cache_dir):
+    path = os.path.join(cache_dir, "reports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def store_summary(summary, digest, cache_dir=DEFAULT_CACHE_DIR):
+    # Pickle first, metadata last, so a listed entry is always complete
+    folder = _reports_dir(cache_dir)
+    tmp = os.path.join(folder, f"{digest}.pkl.tmp")
+    with open(tmp, 'wb') as out:
+        pickle.dump(summary, out, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, os.path.join(folder, f"{digest}.pkl"))
+    meta = {
+        'digest': digest,
+        'name': summary.get('name'),
+        'path': summary.get('path'),
+        'transactions': summary.get('transactions'),
+        'best_run': summary.get('best_run'),
+        'stored_at': time.time(),
+    }
+    with open(os.path.join(folder, f"{digest}.json"), 'w') as out:
+        json.dump(meta, out)
+
+
+def load_summary(digest, cache_dir=DEFAULT_CACHE_DIR):
+    with open(os.path.join(_reports_dir(cache_dir), f"{digest}.pkl"), 'rb') as source:
+        return pickle.load(source)
+
+
+def list_cached(cache_dir=DEFAULT_CACHE_DIR):
+    folder = _reports_dir(cache_dir)
+    entries = []
+    for name in os.listdir(folder):
+        if name.endswith('.json'):
+            with open(os.path.join(folder, name)) as source:
+                entries.append(json.load(source))
+    return sorted(entries, key=lambda entry: entry['stored_at'], reverse=True)
+
+
+def is_cached(digest, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.exists(os.path.join(_reports_dir(cache_dir), f"{digest}.json"))
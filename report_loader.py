@@ -0,0 +1,193 @@
+import bz2
+import gzip
+import hashlib
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from cache_registry import ManagedCache
+from metrics import LOAD_SECONDS
+from report_schema import DEFAULT_METRIC, parse_run_column, run_columns
+from result_parsers import RAW_SUFFIXES, read_raw_results
+
+SAMPLE_ROWS = 500
+# Rows per parser chunk when streaming a decompressed CSV
+CHUNK_ROWS = 100_000
+UPLOAD_TYPES = ["csv", "xlsx", "txt", "jtl", "xml", "json", "ndjson", "gz", "zst", "bz2", "zip"]
+COMPRESSED_SUFFIXES = ('.gz', '.zst', '.bz2')
+# Formats parsed front to back; anything else is a workbook
+STREAMED_SUFFIXES = ('.csv', '.txt') + RAW_SUFFIXES
+# Fully parsed reports kept per server process, oldest dropped first
+MAX_LOADED_REPORTS = 4
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report-loader")
+_loads = ManagedCache("report loads", max_entries=MAX_LOADED_REPORTS)
+_lock = threading.Lock()
+
+
+_digests = {}
+# Upload digests remembered per file_id, so reruns do not rehash the same bytes
+MAX_DIGESTS = 64
+
+
+def file_key(file):
+    # Content-addressed: two uploads share cached work only when their bytes match
+    upload_id = getattr(file, 'file_id', None)
+    digest = _digests.get(upload_id) if upload_id is not None else None
+    if digest is None:
+        digest = hashlib.blake2b(file.getvalue(), digest_size=16).hexdigest()
+        if upload_id is not None:
+            if len(_digests) >= MAX_DIGESTS:
+                _digests.pop(next(iter(_digests)))
+            _digests[upload_id] = digest
+    return f"{file.name}:{digest}"
+
+
+def _open_decompressed(source, suffix):
+    if suffix == '.gz':
+        return gzip.GzipFile(fileobj=source, mode='rb')
+    if suffix == '.bz2':
+        return bz2.BZ2File(source, mode='rb')
+    if zstandard is None:
+        raise ValueError("Reading .zst files requires the zstandard package.")
+    # Multi-frame files (e.g. concatenated or pzstd output) would otherwise stop after the first frame
+    return zstandard.ZstdDecompressor().stream_reader(source, read_across_frames=True)
+
+
+def _read_plain(source, name, nrows=None):
+    lower = name.lower()
+    if lower.endswith(RAW_SUFFIXES):
+        # Raw JMeter/k6 samples are aggregated into the dashboard schema
+        return read_raw_results(source, name, nrows=nrows)
+    if lower.endswith('.csv') or lower.endswith('.txt'):
+        options = {'sep': None, 'engine': 'python'} if lower.endswith('.txt') else {}
+        if nrows is not None:
+            return pd.read_csv(source, nrows=nrows, **options)
+        # Chunked parsing keeps only one decompressed block in memory at a time
+        chunks = list(pd.read_csv(source, chunksize=CHUNK_ROWS, **options))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if not source.seekable():
+        # openpyxl needs random access, so compressed workbooks are inflated into memory
+        source = BytesIO(source.read())
+    return pd.read_excel(source, nrows=nrows)
+
+
+def value_column(frame):
+    runs = run_columns(frame.columns)
+    if runs:
+        return runs[0]
+    candidates = [col for col in frame.columns if '90Percent' in str(col)]
+    if candidates:
+        return candidates[0]
+    numeric = [col for col in frame.select_dtypes('number').columns if col != 'SLA']
+    if not numeric:
+        raise ValueError("Archive member has no response time column.")
+    return numeric[0]
+
+
+def combine_runs(frames):
+    # Archive members are joined on TransactionName and their runs renumbered in member order, so two members
+    # holding Run1 and Run2 become Run1-Run4 with every metric kept. A member without run columns is one run
+    combined = None
+    next_number = 1
+    for member, frame in frames:
+        if 'TransactionName' not in frame.columns:
+            raise ValueError(f"{member} has no TransactionName column.")
+        parsed = {col: value for col in frame.columns if (value := parse_run_column(col)) is not None}
+        if parsed:
+            numbers = sorted({number for number, _ in parsed.values()})
+            renumber = {number: next_number + i for i, number in enumerate(numbers)}
+            renamed = {col: f'Run{renumber[number]}-{metric}' for col, (number, metric) in parsed.items()}
+            next_number += len(numbers)
+        else:
+            renamed = {value_column(frame): f'Run{next_number}-{DEFAULT_METRIC}'}
+            next_number += 1
+        run_frame = frame[['TransactionName', *renamed]].rename(columns=renamed)
+        if 'SLA' in frame.columns:
+            run_frame.insert(1, 'SLA', frame['SLA'])
+        if combined is None:
+            combined = run_frame
+            continue
+        combined = combined.merge(run_frame, on='TransactionName', how='outer', suffixes=('', '_new'))
+        if 'SLA_new' in combined.columns:
+            combined['SLA'] = combined['SLA'].combine_first(combined.pop('SLA_new'))
+    return combined if combined is not None else pd.DataFrame()
+
+
+def _read_archive(source, nrows=None):
+    frames = []
+    with zipfile.ZipFile(source) as archive:
+        members = sorted(info.filename for info in archive.infolist()
+                         if not info.is_dir() and not info.filename.startswith('__MACOSX/'))
+        for member in members:
+            with archive.open(member) as stream:
+                frames.append((member, read_report(stream, member, nrows=nrows)))
+    # A single-member archive is just a compressed report
+    if len(frames) == 1:
+        return frames[0][1]
+    return combine_runs(frames)
+
+
+def read_report(source, name, nrows=None):
+    lower = name.lower()
+    if lower.endswith('.zip'):
+        return _read_archive(source, nrows=nrows)
+    for suffix in COMPRESSED_SUFFIXES:
+        if lower.endswith(suffix):
+            inner = name[:-len(suffix)]
+            with _open_decompressed(source, suffix) as stream:
+                if not inner.lower().endswith(STREAMED_SUFFIXES):
+                    # openpyxl seeks from the end, which GzipFile refuses even though seekable() is True
+                    stream = BytesIO(stream.read())
+                return _read_plain(stream, inner, nrows=nrows)
+    return _read_plain(source, name, nrows=nrows)
+
+
+def _buffer(file):
+    # getvalue() hands back the upload's bytes without copying, so each phase gets its own cursor cheaply
+    return BytesIO(file.getvalue())
+
+
+def _timed_read(stage, source, name, nrows=None):
+    with LOAD_SECONDS.time(stage=stage):
+        return read_report(source, name, nrows=nrows)
+
+
+def load_progressive(file, sample_rows=SAMPLE_ROWS):
+    # Phase one parses only the header and a sample; phase two parses everything on a worker thread.
+    # The lock covers only the lookup and insert: the first caller registers a placeholder for the sample and
+    # parses it outside the lock, so loads of other files never wait on this one.
+    key = file_key(file)
+    owner = False
+    with _lock:
+        entry = _loads.get(key)
+        if entry is None:
+            entry = (Future(), _executor.submit(_timed_read, "full", _buffer(file), file.name))
+            _loads.put(key, entry)
+            owner = True
+    sample, future = entry
+    if owner:
+        try:
+            sample.set_result(_timed_read("sample", _buffer(file), file.name, nrows=sample_rows))
+        except Exception as exc:
+            # Later reruns retry instead of finding the failure cached
+            sample.set_exception(exc)
+            with _lock:
+                if _loads.peek(key) is entry:
+                    _loads.purge(key)
+    if future.done():
+        return future.result(), True
+    return sample.result(), False
+
+
+def report_ready(file):
+    entry = _loads.peek(file_key(file))
+    return entry is None or entry[1].done()
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from metric_cube import MetricCube
+from report_loader import read_report
+from report_schema import DEFAULT_METRIC, parse_run_column, run_columns
+from sla_rules import DEFAULT_RULES, compile_rules
+
+REPORT_SUFFIXES = ('.csv', '.xlsx', '.txt', '.jtl', '.xml', '.json', '.ndjson', '.gz', '.zst', '.bz2', '.zip')
+
+
+def load_report(path):
+    with open(path, 'rb') as source:
+        return read_report(source, os.path.basename(path))
+
+
+def normalize(df):
+    df = df.rename(columns=lambda col: str(col).strip())
+    if 'TransactionName' in df.columns:
+        df['TransactionName'] = df['TransactionName'].astype(str).str.strip()
+    for col in df.columns:
+        if col == 'SLA' or parse_run_column(col) is not None:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+
+def summarize(df, metric=DEFAULT_METRIC, rules=DEFAULT_RULES):
+    # Everything the dashboards derive from a report: run means, best run, SLA matrix and trend data
+    cube = MetricCube.from_frame(df)
+    run_cols = run_columns(df.columns, metric)
+    run_means = cube.run_means(metric) if metric in cube.metric_index else {}
+    run_means = {col: run_means[col] for col in run_cols if col in run_means}
+    valid_means = {col: value for col, value in run_means.items() if not np.isnan(value)}
+    best_run = min(valid_means, key=valid_means.get) if valid_means else None
+
+    sla_severity, sla_breaches = None, {}
+    if 'SLA' in df.columns and metric in cube.metric_index:
+        sla_severity, _ = compile_rules(rules, cube, metric).evaluate(cube, columns={'SLA': df['SLA'].to_numpy()})
+        # The rules already leave runs without this metric's column at OK, so the stored severity is masked too
+        sla_breaches = {f'{run}-{metric}': int((sla_severity[:, i] > 0).sum()) for i, run in enumerate(cube.runs)
+                        if f'{run}-{metric}' in run_cols}
+
+    trend = None
+    if 'TransactionName' in df.columns and run_cols:
+        trend = df.melt(id_vars='TransactionName', value_vars=run_cols, var_name='Run', value_name='Response Time')
+
+    return {
+        'metric': metric,
+        'cube': cube,
+        'transactions': int(len(df)),
+        'run_means': run_means,
+        'best_run': best_run,
+        'sla_severity': sla_severity,
+        'sla_breaches': sla_breaches,
+        'trend': trend,
+    }
+
+
+def analyze(path, metric=DEFAULT_METRIC):
+    # load -> normalize -> SLA -> aggregate, as used by the watch-folder daemon and batch mode
+    df = normalize(load_report(path))
+    summary = summarize(df, metric)
+    summary['frame'] = df
+    summary['name'] = os.path.basename(path)
+    summary['path'] = os.path.abspath(path)
+    return summary
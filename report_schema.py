@@ -0,0 +1,24 @@
+import re
+
+# Run columns follow the "Run<N>-<metric>" naming used by every dashboard, e.g. Run1-90Percent
+RUN_COLUMN_RE = re.compile(r"^Run(\d+)-(.+)$")
+DEFAULT_METRIC = "90Percent"
+KNOWN_METRICS = ["90Percent", "Avg", "95Percent", "99Percent", "Max", "Throughput", "Errors"]
+
+
+def parse_run_column(column):
+    match = RUN_COLUMN_RE.match(str(column))
+    if match is None:
+        return None
+    return int(match.group(1)), match.group(2)
+
+
+def run_columns(columns, metric=DEFAULT_METRIC):
+    runs = [(parsed[0], col) for col in columns
+            if (parsed := parse_run_column(col)) is not None and parsed[1] == metric]
+    return [col for _, col in sorted(runs)]
+
+
+def report_metrics(columns):
+    found = {parsed[1] for col in columns if (parsed := parse_run_column(col)) is not None}
+    return [m for m in KNOWN_METRICS if m in found] + sorted(found - set(KNOWN_METRICS))
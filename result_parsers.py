@@ -0,0 +1,214 @@
+import io
+import itertools
+import json
+import xml.etree.ElementTree as ET
+
+import numpy as np
+import pandas as pd
+
+from kernels import group_offsets, grouped_percentile, sort_by_group
+
+RAW_SUFFIXES = ('.jtl', '.xml', '.json', '.ndjson')
+JTL_COLUMNS = ['timeStamp', 'elapsed', 'label', 'success']
+# Growth step for the preallocated arrays used by the streaming decoders
+BLOCK_SIZE = 1 << 16
+
+
+class SampleBuffer:
+    # Typed, append-only columns (int64 epoch-ms, float32 latency, int32 label code, bool success)
+    def __init__(self):
+        self.size = 0
+        self.timestamps = np.empty(BLOCK_SIZE, dtype=np.int64)
+        self.elapsed = np.empty(BLOCK_SIZE, dtype=np.float32)
+        self.codes = np.empty(BLOCK_SIZE, dtype=np.int32)
+        self.success = np.empty(BLOCK_SIZE, dtype=bool)
+        self.labels = {}
+
+    def append(self, timestamp, elapsed, label, success):
+        if self.size == len(self.elapsed):
+            grow = len(self.elapsed)
+            self.timestamps = np.concatenate([self.timestamps, np.empty(grow, dtype=np.int64)])
+            self.elapsed = np.concatenate([self.elapsed, np.empty(grow, dtype=np.float32)])
+            self.codes = np.concatenate([self.codes, np.empty(grow, dtype=np.int32)])
+            self.success = np.concatenate([self.success, np.empty(grow, dtype=bool)])
+        i = self.size
+        self.timestamps[i] = timestamp
+        self.elapsed[i] = elapsed
+        self.codes[i] = self.labels.setdefault(label, len(self.labels))
+        self.success[i] = success
+        self.size += 1
+
+    def to_samples(self):
+        names = np.empty(len(self.labels), dtype=object)
+        for label, code in self.labels.items():
+            names[code] = label
+        n = self.size
+        return Samples(self.timestamps[:n], self.elapsed[:n], self.codes[:n], names, self.success[:n])
+
+
+class Samples:
+    def __init__(self, timestamps, elapsed, codes, names, success):
+        self.timestamps = timestamps
+        self.elapsed = elapsed
+        self.codes = codes
+        self.names = names
+        self.success = success
+
+    def __len__(self):
+        return len(self.elapsed)
+
+    def to_frame(self):
+        return pd.DataFrame({
+            'Timestamp': pd.to_datetime(self.timestamps, unit='ms'),
+            'TransactionName': pd.Categorical.from_codes(self.codes, categories=self.names),
+            'ResponseTime': self.elapsed,
+            'Success': self.success,
+        })
+
+
+def parse_jtl_csv(source, nrows=None):
+    # JMeter CSV results: only the needed columns are decoded, straight into typed arrays
+    frame = pd.read_csv(
+        source, usecols=JTL_COLUMNS, nrows=nrows,
+        dtype={'timeStamp': np.int64, 'elapsed': np.float32, 'label': 'category', 'success': 'string'},
+    )
+    labels = frame['label'].cat
+    codes = labels.codes.to_numpy().astype(np.int32)
+    names = labels.categories.to_numpy(dtype=object)
+    if (codes < 0).any():
+        # Rows with an empty label get their own name instead of code -1, which the grouped kernels cannot index
+        codes[codes < 0] = len(names)
+        names = np.append(names, '')
+    return Samples(
+        frame['timeStamp'].to_numpy(), frame['elapsed'].to_numpy(), codes, names,
+        frame['success'].str.lower().eq('true').to_numpy(dtype=bool),
+    )
+
+
+def parse_jtl_xml(source, nrows=None):
+    # Only top-level samples count: a transaction controller's <sample> already covers its child <httpSample>s.
+    # Each finished sample is detached from the root, so memory stays flat however long the file is.
+    buffer = SampleBuffer()
+    depth = 0
+    root = None
+    for event, element in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        if element.tag in ('httpSample', 'sample'):
+            buffer.append(int(element.get('ts', 0)), float(element.get('t', 'nan')),
+                          element.get('lb', ''), element.get('s', 'true') == 'true')
+            if nrows is not None and buffer.size >= nrows:
+                break
+        root.clear()
+    return buffer.to_samples()
+
+
+def _json_string(key):
+    return r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"' % key
+
+
+# One vectorised regex pass per field over a batch of lines; key order inside a k6 record is not fixed
+K6_FIELDS = {
+    'type': _json_string('type'),
+    'metric': _json_string('metric'),
+    'time': _json_string('time'),
+    'value': r'"value"\s*:\s*(-?[0-9][0-9.eE+-]*)',
+    'name': _json_string('name'),
+    'url': _json_string('url'),
+    'expected': r'"expected_response"\s*:\s*"?(true|false)',
+}
+K6_BATCH_LINES = 1 << 16
+
+
+def _k6_batch(lines, metric):
+    batch = pd.Series(lines, dtype=object)
+    if isinstance(lines[0], bytes):
+        batch = batch.str.decode('utf-8')
+    batch = batch[batch.str.contains('"Point"', regex=False) & batch.str.contains(f'"{metric}"', regex=False)]
+    fields = {field: batch.str.extract(pattern, expand=False) for field, pattern in K6_FIELDS.items()}
+    keep = (fields['type'] == 'Point') & (fields['metric'] == metric) & fields['time'].notna() & fields['value'].notna()
+    labels = fields['name'].fillna(fields['url']).fillna('')[keep]
+    escaped = labels.str.contains('\\', regex=False)
+    if escaped.any():
+        # Only labels with JSON escapes are decoded one by one
+        labels = labels.mask(escaped, labels[escaped].map(lambda label: json.loads(f'"{label}"')))
+    return (fields['time'][keep], pd.to_numeric(fields['value'][keep]).to_numpy(dtype=np.float32),
+            labels, fields['expected'][keep].fillna('true').eq('true').to_numpy(dtype=bool))
+
+
+def parse_k6_json(source, metric='http_req_duration', nrows=None):
+    # k6 --out json writes one JSON object per line; duration points are picked out of each batch of lines
+    # with column-wise string extraction instead of building a dict per record
+    times, elapsed, labels, success = [], [], [], []
+    found = 0
+    while nrows is None or found < nrows:
+        lines = list(itertools.islice(source, K6_BATCH_LINES))
+        if not lines:
+            break
+        batch = _k6_batch(lines, metric)
+        for column, values in zip((times, elapsed, labels, success), batch):
+            column.append(values)
+        found += len(batch[1])
+    if not times:
+        return Samples(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32), np.empty(0, dtype=np.int32),
+                       np.empty(0, dtype=object), np.empty(0, dtype=bool))
+    codes, names = pd.factorize(pd.concat(labels, ignore_index=True))
+    when = pd.to_datetime(pd.concat(times, ignore_index=True), utc=True)
+    samples = Samples(when.astype('int64').to_numpy() // 1_000_000, np.concatenate(elapsed),
+                      codes.astype(np.int32), np.asarray(names, dtype=object), np.concatenate(success))
+    if nrows is not None:
+        samples = Samples(samples.timestamps[:nrows], samples.elapsed[:nrows], samples.codes[:nrows],
+                          samples.names, samples.success[:nrows])
+    return samples
+
+
+def parse_samples(source, name, nrows=None):
+    lower = name.lower()
+    if lower.endswith('.xml'):
+        return parse_jtl_xml(source, nrows=nrows)
+    if lower.endswith('.json') or lower.endswith('.ndjson'):
+        return parse_k6_json(source, nrows=nrows)
+    if lower.endswith('.jtl'):
+        # JTL can be either CSV or XML; sniff the first byte with a buffered peek, which leaves
+        # non-seekable streams (zstd) where they were
+        if not hasattr(source, 'peek'):
+            source = io.BufferedReader(source)
+        head = source.peek(64).lstrip(b'\xef\xbb\xbf \t\r\n')[:1]
+        if head == b'<':
+            return parse_jtl_xml(source, nrows=nrows)
+    return parse_jtl_csv(source, nrows=nrows)
+
+
+def aggregate_samples(samples, run_name='Run1', percentile=90):
+    # Per-label percentile over (code, latency)-sorted samples via the grouped kernels, not a groupby
+    n_labels = len(samples.names)
+    if len(samples) == 0:
+        return pd.DataFrame({'TransactionName': samples.names, f'{run_name}-{percentile}Percent': np.nan})
+    codes, sorted_elapsed = sort_by_group(samples.codes, samples.elapsed)
+    offsets = group_offsets(codes, n_labels)
+    values = grouped_percentile(sorted_elapsed, offsets, percentile / 100.0)
+    errors = np.bincount(samples.codes, weights=~samples.success, minlength=n_labels)
+    return pd.DataFrame({
+        'TransactionName': samples.names,
+        f'{run_name}-{percentile}Percent': values.astype(np.float32),
+        f'{run_name}-Samples': np.diff(offsets),
+        f'{run_name}-Errors': errors.astype(np.int64),
+    })
+
+
+def is_jtl_frame(columns):
+    return {'label', 'elapsed'}.issubset(columns)
+
+
+def read_raw_results(source, name, run_name='Run1', nrows=None):
+    samples = parse_samples(source, name, nrows=nrows)
+    if len(samples) == 0:
+        # A .json/.xml that is not k6 or JTL output parses to nothing; say so instead of showing an empty report
+        raise ValueError(f"{name} contains no JMeter or k6 samples.")
+    return aggregate_samples(samples, run_name=run_name)
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from kernels import group_offsets, grouped_breach_count, grouped_histogram, grouped_percentile, sort_by_group
+from report_cache import DEFAULT_CACHE_DIR
+from result_parsers import Samples
+
+FORMAT_VERSION = 2
+INT32_MAX = np.iinfo(np.int32).max
+
+
+def write_store(path, samples):
+    # Rows are sorted by (transaction code, timestamp) so every transaction is one contiguous slice
+    os.makedirs(path, exist_ok=True)
+    order = np.lexsort((samples.timestamps, samples.codes))
+    timestamps = np.asarray(samples.timestamps, dtype=np.int64)[order]
+    base = int(timestamps.min()) if len(timestamps) else 0
+    offsets_ms = timestamps - base
+    unit = 'ms'
+    if len(offsets_ms) and offsets_ms.max() > INT32_MAX:
+        # Runs longer than ~24 days no longer fit int32 milliseconds
+        offsets_ms, unit = offsets_ms // 1000, 's'
+    codes = np.asarray(samples.codes, dtype=np.int32)[order]
+    counts = np.bincount(codes, minlength=len(samples.names))
+
+    np.save(os.path.join(path, 'timestamps.npy'), offsets_ms.astype(np.int32))
+    np.save(os.path.join(path, 'latency.npy'), np.asarray(samples.elapsed, dtype=np.float32)[order])
+    np.save(os.path.join(path, 'codes.npy'), codes)
+    np.save(os.path.join(path, 'success.npy'), np.asarray(samples.success, dtype=bool)[order])
+    np.save(os.path.join(path, 'offsets.npy'), np.concatenate([[0], np.cumsum(counts)]).astype(np.int64))
+    # meta.json is written last and marks the store as complete
+    with open(os.path.join(path, 'meta.json'), 'w') as out:
+        json.dump({'version': FORMAT_VERSION, 'base_timestamp': base, 'timestamp_unit': unit,
+                   'count': int(len(codes)), 'transactions': [str(name) for name in samples.names]}, out)
+
+
+def samples_from_frame(df, latency_col, name_col=None, time_col=None, success_col=None):
+    if name_col is not None and name_col in df.columns:
+        codes, names = pd.factorize(df[name_col].astype(str))
+    else:
+        codes, names = np.zeros(len(df), dtype=np.int64), np.array(['All'], dtype=object)
+    if time_col is not None and time_col in df.columns:
+        stamps = pd.to_datetime(df[time_col], errors='coerce')
+        # Unparseable timestamps (NaT) take the earliest valid one rather than overflowing the int32 offsets
+        stamps = stamps.fillna(stamps.min() if stamps.notna().any() else pd.Timestamp(0))
+        timestamps = stamps.astype('int64').to_numpy() // 1_000_000
+    else:
+        timestamps = np.arange(len(df), dtype=np.int64)
+    success = df[success_col].astype(bool).to_numpy() if success_col is not None and success_col in df.columns else np.ones(len(df), bool)
+    return Samples(timestamps, pd.to_numeric(df[latency_col], errors='coerce').to_numpy(dtype=np.float32),
+                   codes.astype(np.int32), np.asarray(names, dtype=object), success)
+
+
+class SampleStore:
+    # Memory-mapped columns; slicing by transaction or time range returns views, not copies
+    def __init__(self, path):
+        with open(os.path.join(path, 'meta.json')) as source:
+            self.meta = json.load(source)
+        load = lambda name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')
+        self.timestamps = load('timestamps')
+        self.latency = load('latency')
+        self.codes = load('codes')
+        self.success = load('success')
+        self.offsets = load('offsets')
+        self.transactions = self.meta['transactions']
+        self.transaction_index = {name: i for i, name in enumerate(self.transactions)}
+        self.scale = 1 if self.meta['timestamp_unit'] == 'ms' else 1000
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(os.path.join(path, 'meta.json'))
+
+    def __len__(self):
+        return self.meta['count']
+
+    def span(self, name):
+        code = self.transaction_index[name]
+        return int(self.offsets[code]), int(self.offsets[code + 1])
+
+    def transaction(self, name):
+        start, end = self.span(name)
+        return self.timestamps[start:end], self.latency[start:end]
+
+    def time_slice(self, name, start_ms=None, end_ms=None):
+        # Timestamps are sorted within a transaction, so a range is two binary searches
+        start, end = self.span(name)
+        stamps = self.timestamps[start:end]
+        base = self.meta['base_timestamp']
+        low = 0 if start_ms is None else np.searchsorted(stamps, (start_ms - base) // self.scale, side='left')
+        high = len(stamps) if end_ms is None else np.searchsorted(stamps, (end_ms - base) // self.scale, side='right')
+        return self.latency[start + low:start + high]
+
+    def sorted_latency(self):
+        # Measured latencies sorted within each transaction, with their own offsets, built once for the grouped kernels
+        if not hasattr(self, '_sorted_latency'):
+            codes, values = sort_by_group(np.asarray(self.codes), np.asarray(self.latency))
+            self._sorted_latency = values, group_offsets(codes, len(self.transactions))
+        return self._sorted_latency
+
+    def percentiles(self, qs=(90, 95, 99)):
+        values, offsets = self.sorted_latency()
+        frame = pd.DataFrame({'TransactionName': self.transactions, 'Samples': np.diff(np.asarray(self.offsets))})
+        for q in qs:
+            frame[f'{q}Percent'] = grouped_percentile(values, offsets, q / 100)
+        return frame
+
+    def breach_counts(self, thresholds):
+        # Samples above the limit per transaction; thresholds is a scalar or one limit per transaction
+        return grouped_breach_count(self.latency, np.asarray(self.offsets), thresholds)
+
+    def histograms(self, edges):
+        # [transaction, bin] counts straight from the memory-mapped latencies
+        return grouped_histogram(self.latency, np.asarray(self.offsets), edges)
+
+    def absolute_timestamps(self, start=0, end=None):
+        return self.meta['base_timestamp'] + self.timestamps[start:end].astype(np.int64) * self.scale
+
+
+def store_path(data_key, cache_dir=DEFAULT_CACHE_DIR):
+    # data_key must identify the content (report_loader.file_key does); the format version retires old layouts
+    return os.path.join(cache_dir, 'samples', f"v{FORMAT_VERSION}-{hashlib.sha1(data_key.encode()).hexdigest()}")
@@ -0,0 +1,180 @@
+import json
+import operator
+
+import numpy as np
+import pandas as pd
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+OK, WARNING, CRITICAL = 0, 1, 2
+SEVERITIES = {'warning': WARNING, 'critical': CRITICAL}
+STATUS_ICONS = {OK: "✅", WARNING: "⚠️", CRITICAL: "❌"}
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le}
+MISSING_POLICIES = ('breach', 'ok')
+
+# Equivalent of the original "run <= SLA" check; metric None means the metric selected in the UI
+DEFAULT_RULES = {'rules': [{'name': 'SLA', 'threshold': 'SLA', 'severity': 'critical'}]}
+
+
+def load_rules(text, name='rules.json'):
+    if name.lower().endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ValueError("YAML rule files require the PyYAML package.")
+        try:
+            spec = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ValueError(str(exc)) from exc
+    else:
+        spec = json.loads(text)
+    if not isinstance(spec, dict) or not isinstance(spec.get('rules'), list):
+        raise ValueError("Rule file must contain a 'rules' list.")
+    for index, rule in enumerate(spec['rules'], start=1):
+        _check_rule(index, rule)
+    return spec
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_rule(index, rule):
+    # Malformed rules are rejected here with their position, not as a TypeError while compiling
+    if not isinstance(rule, dict):
+        raise ValueError(f"Rule {index} must be a mapping, not {type(rule).__name__}.")
+    where = f"Rule {index} ({rule['name']!r})" if 'name' in rule else f"Rule {index}"
+    if rule.get('severity', 'critical') not in SEVERITIES:
+        raise ValueError(f"{where}: unknown severity {rule.get('severity')!r}.")
+    if rule.get('op', '>') not in OPERATORS:
+        raise ValueError(f"{where}: unknown operator {rule.get('op')!r}.")
+    threshold = rule.get('threshold', 'SLA')
+    if not (isinstance(threshold, str) or _is_number(threshold)):
+        raise ValueError(f"{where}: threshold must be a column name or a number.")
+    if rule.get('missing', 'breach') not in MISSING_POLICIES:
+        raise ValueError(f"{where}: missing must be one of {', '.join(MISSING_POLICIES)}.")
+    if not _is_number(rule.get('factor', 1.0)):
+        raise ValueError(f"{where}: factor must be a number.")
+    for key in ('metric', 'divide_by'):
+        if rule.get(key) is not None and not isinstance(rule[key], str):
+            raise ValueError(f"{where}: {key} must be a metric name.")
+    window = rule.get('window')
+    if window is not None:
+        if not isinstance(window, dict) or not all(_is_integer(window.get(key)) for key in ('breaches', 'runs')):
+            raise ValueError(f"{where}: window must be {{breaches: <int>, runs: <int>}}.")
+        if not 1 <= window['breaches'] <= window['runs']:
+            raise ValueError(f"{where}: window needs 1 <= breaches <= runs.")
+    runs = rule.get('runs')
+    if runs is not None and (not isinstance(runs, list) or not runs or not all(isinstance(run, str) for run in runs)):
+        raise ValueError(f"{where}: runs must be a non-empty list of run names such as [Run1, Run2].")
+    transactions = rule.get('transactions')
+    if transactions is not None and (not isinstance(transactions, dict)
+                                     or not all(_is_number(value) for value in transactions.values())):
+        raise ValueError(f"{where}: transactions must map transaction names to numeric thresholds.")
+
+
+class CompiledRule:
+    def __init__(self, spec, cube, default_metric):
+        self.name = spec.get('name', 'rule')
+        self.severity = SEVERITIES[spec.get('severity', 'critical')]
+        self.metric = spec.get('metric') or default_metric
+        self.divide_by = spec.get('divide_by')
+        self.threshold = spec.get('threshold', 'SLA')
+        self.factor = float(spec.get('factor', 1.0))
+        self.op = OPERATORS[spec.get('op', '>')]
+        window = spec.get('window')
+        self.window = (int(window['breaches']), int(window['runs'])) if window else None
+        self.runs = spec.get('runs')
+        # Missing values breach by default, as the original "run <= SLA" check did
+        self.missing_breaches = spec.get('missing', 'breach') == 'breach'
+        # Per-transaction overrides are resolved once against the cube's transaction order
+        self.overrides = None
+        if spec.get('transactions'):
+            overrides = pd.Series(spec['transactions'], dtype='float32')
+            self.overrides = pd.Series(cube.transactions).map(overrides).to_numpy(dtype=np.float32)
+        self.metric_pos = cube.metric_index.get(self.metric)
+        self.divide_pos = cube.metric_index.get(self.divide_by) if self.divide_by else None
+        self.run_mask = None
+        if self.runs:
+            self.run_mask = np.isin(cube.runs, self.runs)
+
+    def applies(self):
+        return self.metric_pos is not None and (self.divide_by is None or self.divide_pos is not None)
+
+    def evaluate(self, cube, rows, columns):
+        values = cube.metric(self.metric)
+        if rows is not None:
+            values = values[rows]
+        measured = cube.runs_with(self.metric)
+        if self.divide_pos is not None:
+            measured = measured & cube.runs_with(self.divide_by)
+            denominator = cube.metric(self.divide_by)
+            denominator = denominator[rows] if rows is not None else denominator
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = values / denominator
+
+        if isinstance(self.threshold, str):
+            threshold = np.asarray(columns[self.threshold], dtype=np.float32)
+        else:
+            threshold = np.full(len(values), self.threshold, dtype=np.float32)
+        if self.overrides is not None:
+            overrides = self.overrides[rows] if rows is not None else self.overrides
+            threshold = np.where(np.isnan(overrides), threshold, overrides)
+        limit = (threshold * self.factor)[:, None]
+        with np.errstate(invalid='ignore'):
+            breached = self.op(values, limit)
+        if self.missing_breaches:
+            breached |= np.isnan(values) | np.isnan(limit)
+        # A run without a column for this metric has no results to breach, whatever the missing policy
+        breached &= measured
+        if self.run_mask is not None:
+            breached &= self.run_mask
+
+        if self.window:
+            # "N breaches in the last M runs", evaluated at every run with one cumulative sum
+            needed, span = self.window
+            counts = np.cumsum(breached, axis=1, dtype=np.int32)
+            trailing = counts.copy()
+            trailing[:, span:] -= counts[:, :-span]
+            breached = trailing >= needed
+        return breached
+
+
+class RuleSet:
+    def __init__(self, spec, cube, default_metric):
+        rules = [CompiledRule(rule, cube, default_metric) for rule in spec.get('rules', [])]
+        self.rules = [rule for rule in rules if rule.applies()]
+        self.skipped = [rule.name for rule in rules if not rule.applies()]
+
+    def required_columns(self):
+        return sorted({rule.threshold for rule in self.rules if isinstance(rule.threshold, str)})
+
+    @staticmethod
+    def _has_threshold(rule, columns):
+        return not isinstance(rule.threshold, str) or (columns is not None and rule.threshold in columns)
+
+    def skipped_for(self, columns=None):
+        # Rules whose metric is not in the report, plus rules whose threshold column is missing from columns
+        return self.skipped + [rule.name for rule in self.rules if not self._has_threshold(rule, columns)]
+
+    def evaluate(self, cube, rows=None, columns=None):
+        # Returns the worst severity per [transaction, run] and the number of cells each rule flagged
+        size = len(rows) if rows is not None else len(cube.transactions)
+        severity = np.zeros((size, len(cube.runs)), dtype=np.int8)
+        hits = {}
+        for rule in self.rules:
+            if not self._has_threshold(rule, columns):
+                continue
+            breached = rule.evaluate(cube, rows, columns)
+            hits[rule.name] = int(breached.sum())
+            np.maximum(severity, breached.astype(np.int8) * np.int8(rule.severity), out=severity)
+        return severity, hits
+
+
+def compile_rules(spec, cube, default_metric):
+    return RuleSet(spec, cube, default_metric)
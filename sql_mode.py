@@ -0,0 +1,134 @@
+import os
+import tempfile
+import weakref
+
+from report_loader import read_report
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+HAVE_DUCKDB = duckdb is not None
+TABLE_NAME = "report"
+SCANNABLE_SUFFIXES = (".csv", ".csv.gz", ".csv.zst")
+# DuckDB vectors hold 2048 rows; results are streamed a few vectors at a time
+VECTORS_PER_BATCH = 32
+# Placeholder column for an empty projection; DuckDB cannot select zero columns
+EMPTY_COLUMN = "__no_columns__"
+
+
+def quote_ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _release(con, path):
+    con.close()
+    if path is not None and os.path.exists(path):
+        os.remove(path)
+
+
+class UploadConnection:
+    # Owns the DuckDB connection and the temp copy its view scans; both are released when the cache drops it
+    def __init__(self, con, path=None):
+        self.con = con
+        self.path = path
+        self._finalizer = weakref.finalize(self, _release, con, path)
+
+    def execute(self, sql, params=None):
+        return self.con.execute(sql, params or [])
+
+    def cursor(self):
+        return self.con.cursor()
+
+    def close(self):
+        self._finalizer()
+
+
+def _literal(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _lock_down(con, allowed_path=None):
+    # The custom SQL box runs on a shared server: no file, network or extension access, and no way to re-enable it
+    if allowed_path is not None:
+        con.execute(f"SET allowed_paths = [{_literal(allowed_path)}]")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+
+
+def register_upload(file, table=TABLE_NAME):
+    # CSVs (plain, gzip or zstd) are scanned in place by DuckDB (out-of-core); other formats are loaded into a table
+    con = duckdb.connect(database=":memory:")
+    suffix = next((ext for ext in SCANNABLE_SUFFIXES if file.name.lower().endswith(ext)), None)
+    if suffix is None:
+        con.register("upload_frame", read_report(file, file.name))
+        con.execute(f"CREATE TABLE {quote_ident(table)} AS SELECT * FROM upload_frame")
+        con.unregister("upload_frame")
+        _lock_down(con)
+        return UploadConnection(con)
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    tmp.write(file.getvalue())
+    tmp.close()
+    try:
+        con.execute(f"CREATE VIEW {quote_ident(table)} AS SELECT * FROM read_csv_auto({_literal(tmp.name)})")
+        _lock_down(con, allowed_path=tmp.name)
+    except duckdb.Error:
+        # DuckDB without allowed_paths (< 1.2) cannot keep a file view once external access is off: copy it in
+        con.close()
+        con = duckdb.connect(database=":memory:")
+        con.execute(f"CREATE TABLE {quote_ident(table)} AS SELECT * FROM read_csv_auto({_literal(tmp.name)})")
+        os.remove(tmp.name)
+        _lock_down(con)
+        return UploadConnection(con)
+    return UploadConnection(con, tmp.name)
+
+
+def check_select(sql):
+    # Only a single read-only statement is accepted from the custom SQL box
+    if hasattr(duckdb, 'extract_statements'):
+        statements = duckdb.extract_statements(sql)
+        if len(statements) != 1 or statements[0].type != duckdb.StatementType.SELECT:
+            raise ValueError("Only a single SELECT statement is allowed.")
+    elif not sql.lstrip().lower().startswith(("select", "with")) or ';' in sql.strip().rstrip(';'):
+        raise ValueError("Only a single SELECT statement is allowed.")
+    return sql
+
+
+def column_names(con, table=TABLE_NAME):
+    return [row[0] for row in con.execute(f"DESCRIBE {quote_ident(table)}").fetchall()]
+
+
+def distinct_values(con, column, table=TABLE_NAME):
+    col = quote_ident(column)
+    rows = con.execute(f"SELECT DISTINCT {col} FROM {quote_ident(table)} WHERE {col} IS NOT NULL ORDER BY 1").fetchall()
+    return [row[0] for row in rows]
+
+
+def compile_filters(columns, logical_column=None, selected_vals=None, table=TABLE_NAME):
+    # Sidebar selections become a projected, parameterised SELECT so DuckDB can push both down
+    # An empty selection returns the matching rows with no columns, as the pandas path does
+    projection = ", ".join(quote_ident(col) for col in columns) or f"NULL AS {quote_ident(EMPTY_COLUMN)}"
+    sql = f"SELECT {projection} FROM {quote_ident(table)}"
+    params = []
+    if logical_column is not None and selected_vals is not None:
+        if selected_vals:
+            sql += f" WHERE {quote_ident(logical_column)} IN ({', '.join('?' * len(selected_vals))})"
+            params.extend(selected_vals)
+        else:
+            sql += " WHERE FALSE"
+    return sql, params
+
+
+def stream_query(con, sql, params=None, vectors_per_batch=VECTORS_PER_BATCH):
+    result = con.cursor().execute(sql, params or [])
+    while True:
+        batch = result.fetch_df_chunk(vectors_per_batch)
+        if batch.empty:
+            break
+        yield batch
+
+
+def fetch_frame(con, sql, params=None):
+    frame = con.cursor().execute(sql, params or []).df()
+    return frame.drop(columns=EMPTY_COLUMN) if EMPTY_COLUMN in frame.columns else frame
@@ -0,0 +1,120 @@
+import argparse
+import importlib
+import threading
+import time
+
+from metrics import STARTUP_SECONDS
+from report_cache import list_cached, load_summary
+
+HEAVY_MODULES = ["numpy", "pandas", "plotly.express", "plotly.graph_objects", "plotly.io",
+                 "openpyxl", "docx", "matplotlib.pyplot", "kaleido"]
+
+# Process-wide startup metrics; times in milliseconds
+STARTUP = {'imports': {}, 'renderer_ms': None, 'preloaded': [], 'warmup_ms': None,
+           'first_request_ms': None, 'requests': 0}
+PRELOADED = {}
+_lock = threading.Lock()
+_done = threading.Event()
+_started = False
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def preload_modules(modules=HEAVY_MODULES):
+    for name in modules:
+        try:
+            _, elapsed = _timed(lambda: importlib.import_module(name))
+            STARTUP['imports'][name] = round(elapsed, 1)
+        except ImportError:
+            STARTUP['imports'][name] = None
+
+
+def start_renderer():
+    # Kaleido >= 1.0 can keep one Chromium alive; older Kaleido keeps its subprocess after the first export
+    try:
+        import kaleido
+        import plotly.graph_objects as go
+    except ImportError:
+        return
+    def render():
+        if hasattr(kaleido, 'start_sync_server'):
+            kaleido.start_sync_server(silence_warnings=True)
+        go.Figure(go.Bar(x=[1], y=[1])).to_image(format="png")
+    try:
+        _, STARTUP['renderer_ms'] = _timed(render)
+    except Exception as exc:
+        STARTUP['renderer_error'] = str(exc)
+
+
+def preload_reports(limit=3):
+    for entry in list_cached()[:limit]:
+        try:
+            PRELOADED[entry['digest']] = load_summary(entry['digest'])
+            STARTUP['preloaded'].append(entry['name'])
+        except (OSError, EOFError):
+            continue
+
+
+def warm_up(preload_limit=3, renderer=True):
+    global _started
+    with _lock:
+        if _started:
+            return STARTUP
+        _started = True
+    start = time.perf_counter()
+    preload_modules()
+    if renderer:
+        start_renderer()
+    if preload_limit:
+        preload_reports(preload_limit)
+    STARTUP['warmup_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    STARTUP_SECONDS.set(STARTUP['warmup_ms'] / 1000, phase="warmup")
+    if STARTUP['renderer_ms'] is not None:
+        STARTUP_SECONDS.set(STARTUP['renderer_ms'] / 1000, phase="renderer")
+    _done.set()
+    return STARTUP
+
+
+def warm_up_in_background(preload_limit=3):
+    # For plain `streamlit run`: the first session starts the warm-up instead of paying for it inline
+    if not _started:
+        threading.Thread(target=warm_up, args=(preload_limit,), name="warmup", daemon=True).start()
+
+
+def is_warm():
+    return _done.is_set()
+
+
+def preloaded_summary(digest):
+    return PRELOADED.get(digest)
+
+
+def record_request(elapsed_ms):
+    with _lock:
+        STARTUP['requests'] += 1
+        if STARTUP['first_request_ms'] is None:
+            STARTUP['first_request_ms'] = round(elapsed_ms, 1)
+            STARTUP_SECONDS.set(elapsed_ms / 1000, phase="first_request")
+
+
+def main():
+    # Warm up in this process, then start Streamlit in it so the imports and renderer are already hot
+    parser = argparse.ArgumentParser(description="Start the dashboard with a warm-up phase")
+    parser.add_argument("script", nargs="?", default="IndexP8.py")
+    parser.add_argument("--preload", type=int, default=3, help="most recent cached reports to preload")
+    parser.add_argument("--no-renderer", action="store_true", help="skip starting the Kaleido renderer")
+    args = parser.parse_args()
+
+    warm_up(args.preload, renderer=not args.no_renderer)
+    print(f"warm-up finished in {STARTUP['warmup_ms']} ms: {STARTUP}")
+
+    from streamlit.web import bootstrap
+    bootstrap.run(args.script, False, [], {})
+
+
+if __name__ == "__main__":
+    main()